@@ -7,6 +7,7 @@ import asyncio
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
+from aiogram.types import LinkPreviewOptions
 
 from src.bot.middlewares.state_logger import StateLoggerMiddleware
 from src.bot.routers import date_type_router, start_router, amount_comment_router, command_router, navigation_router,\
@@ -14,6 +15,7 @@ from src.bot.routers import date_type_router, start_router, amount_comment_route
 from src.bot.commands import set_bot_commands
 from src.bot.routers.income import income_router, confirm_income_router
 from src.bot.routers.outcome import outcome_router, outcome_articles, confirm_outcome_router
+from src.bot.routers.transfer.confirm_operation_router import drain_background_tasks
 from src.bot.state.operation_state import storage
 from src.core.config import get_settings
 from src.core.logger import configure_logger
@@ -27,7 +29,10 @@ async def main():
 
     bot = Bot(
         token=settings.bot_token,
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+        default=DefaultBotProperties(
+            parse_mode=ParseMode.HTML,
+            link_preview_options=LinkPreviewOptions(is_disabled=True),
+        ),
     )
     dp = Dispatcher(storage=storage)
 
@@ -61,6 +66,8 @@ async def main():
         await dp.start_polling(bot)
     finally:
         logger.info("Bot is shutting down...")
+        # фоновые записи перемещений ещё используют bot — ждём их до закрытия сессии
+        await drain_background_tasks()
         await bot.session.close()
         await storage.close()
 
@@ -17,7 +17,7 @@ from aiogram.filters.callback_data import CallbackData
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
-from src.db import get_articles, Article
+from src.db import get_articles_cached, Article
 from src.core.config import get_settings
 
 class ArticleCallback(CallbackData, prefix="ART"):
@@ -44,7 +44,7 @@ async def create_article_keyboard(
         InlineKeyboardMarkup с кнопками вида ["№<code> <short_name>"].
     """
     settings = get_settings()
-    articles = await get_articles(session)  # type: List[Article]
+    articles = await get_articles_cached(session)  # type: List[Article]
 
     # Определяем разрешенные коды статей на основе state или operation_type
     allowed_codes = set()
@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
 from src.bot.keyboards import NavCallback
-from src.db import get_contractors, Contractor
+from src.db import get_contractors_cached, Contractor
 
 
 class ContractorCallback(CallbackData, prefix="CTR"):
@@ -35,7 +35,7 @@ async def create_contractor_keyboard(session: AsyncSession, state=None) -> Inlin
     Returns:
         InlineKeyboardMarkup с кнопками вида [<name>].
     """
-    contractors = await get_contractors(session)  # type: List[Contractor]
+    contractors = await get_contractors_cached(session)  # type: List[Contractor]
     items: List[tuple[str, str, ContractorCallback]] = [
         (
             ctr.name,
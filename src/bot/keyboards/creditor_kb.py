@@ -18,7 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
 from src.bot.keyboards import NavCallback
-from src.db import Creditor, get_creditors
+from src.db import Creditor, get_creditors_cached
 
 
 class CreditorCallback(CallbackData, prefix="CRD"):
@@ -37,7 +37,7 @@ async def create_creditor_keyboard(session: AsyncSession, state: Optional[FSMCon
     Returns:
         InlineKeyboardMarkup с кнопками вида [<name>].
     """
-    creditors = await get_creditors(session)  # type: List[Creditor]
+    creditors = await get_creditors_cached(session)  # type: List[Creditor]
     exclude_creditor_id = None
 
     # Получаем outcome_creditor из состояния, если оно доступно
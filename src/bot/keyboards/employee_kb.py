@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
 from src.bot.keyboards import NavCallback
-from src.db import Employee, get_employees
+from src.db import Employee, get_employees_cached
 
 
 class EmployeeCallback(CallbackData, prefix="EMP"):
@@ -35,7 +35,7 @@ async def create_employee_keyboard(session: AsyncSession, state=None) -> InlineK
     Returns:
         InlineKeyboardMarkup с кнопками вида [<name>].
     """
-    employees = await get_employees(session)  # type: List[Employee]
+    employees = await get_employees_cached(session)  # type: List[Employee]
     items: List[tuple[str, str, EmployeeCallback]] = [
         (
             emp.name,
@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
 from src.bot.keyboards import NavCallback
-from src.db import get_founders, Founder
+from src.db import get_founders_cached, Founder
 
 
 class FounderCallback(CallbackData, prefix="FDR"):
@@ -35,7 +35,7 @@ async def create_founder_keyboard(session: AsyncSession, state=None) -> InlineKe
     Returns:
         InlineKeyboardMarkup с кнопками вида [<name>].
     """
-    founders = await get_founders(session)  # type: List[Founder]
+    founders = await get_founders_cached(session)  # type: List[Founder]
     items: List[tuple[str, str, FounderCallback]] = [
         (
             f.name,
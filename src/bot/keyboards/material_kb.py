@@ -15,7 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
 from src.bot.keyboards import NavCallback
-from src.db import get_materials, Material
+from src.db import get_materials_cached, Material
 
 
 class MaterialCallback(CallbackData, prefix="MAT"):
@@ -34,7 +34,7 @@ async def create_material_keyboard(session: AsyncSession, state=None) -> InlineK
     Returns:
         InlineKeyboardMarkup с кнопками вида [<name>].
     """
-    materials = await get_materials(session)  # type: List[Material]
+    materials = await get_materials_cached(session)  # type: List[Material]
     items = [
         (
             m.name,
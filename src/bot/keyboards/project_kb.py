@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
 from src.bot.keyboards import NavCallback
-from src.db import get_projects, Project  # предполагается, что get_projects экспортируется в src/db/__init__.py
+from src.db import get_projects_cached, Project  # предполагается, что get_projects_cached экспортируется в src/db/__init__.py
 
 
 class ProjectCallback(CallbackData, prefix="PRJ"):
@@ -35,7 +35,7 @@ async def create_project_keyboard(session: AsyncSession, state=None) -> InlineKe
     Returns:
         InlineKeyboardMarkup с кнопками вида [<name>].
     """
-    projects = await get_projects(session)  # type: List[Project]
+    projects = await get_projects_cached(session)  # type: List[Project]
     items: List[tuple[str, str, ProjectCallback]] = [
         (
             proj.name,
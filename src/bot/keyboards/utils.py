@@ -23,11 +23,11 @@ async def build_inline_keyboard(
     • Все прочие кнопки группируются по `max_cols` в строке.
     • После длинной кнопки короткие снова группируются (буфер обнуляется).
     • Если передан `state` и текущее состояние существует, добавляется «←Назад»
-      с сохранением `prev_state`.
+      (возврат ведёт navigation_router по `state_history`).
 
     Args:
         items: [(text, any_id, CallbackData), …].
-        state: FSMContext для сохранения prev_state и динамического добавления «Назад».
+        state: FSMContext для динамического добавления «Назад».
         max_cols: максимум кнопок‑столбцов для коротких текстов.
         max_text_length: длина текста, после которой кнопка считается «длинной».
 
@@ -62,7 +62,6 @@ async def build_inline_keyboard(
     if state is not None:
         current_state = await state.get_state()  # Ожидаем корутину
         if current_state:
-            await state.update_data(prev_state=current_state)
             rows.append([InlineKeyboardButton(text="← Назад", callback_data="nav:back")])
 
     return InlineKeyboardMarkup(inline_keyboard=rows)
\ No newline at end of file
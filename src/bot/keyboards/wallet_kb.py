@@ -6,16 +6,17 @@
 • Загружает все кошельки через метод get_wallets.
 • Строит InlineKeyboardMarkup с callback‑схемой WAL.
 • Для отладки выводит все записи без пагинации.
+• Готовая разметка переиспользуется, пока не сменился кэшированный список.
 """
 
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from aiogram.filters.callback_data import CallbackData
 from aiogram.types import InlineKeyboardMarkup
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.keyboards.utils import build_inline_keyboard
-from src.db import get_wallets, Wallet
+from src.db import get_wallets_cached, Wallet
 
 
 class WalletCallback(CallbackData, prefix="WAL"):
@@ -23,6 +24,12 @@ class WalletCallback(CallbackData, prefix="WAL"):
     wallet_id: str
 
 
+# (exclude_wallet, есть «Назад») → (список, по которому собрана разметка; разметка).
+# get_wallets_cached отдаёт один и тот же объект списка до инвалидации / TTL,
+# поэтому совпадение по `is` означает, что разметка актуальна.
+_markup_cache: Dict[Tuple[Optional[str], bool], Tuple[List[Wallet], InlineKeyboardMarkup]] = {}
+
+
 async def create_wallet_keyboard(session: AsyncSession, state=None, exclude_wallet=None) -> InlineKeyboardMarkup:
     """
     Собирает InlineKeyboardMarkup со списком всех кошельков.
@@ -35,10 +42,15 @@ async def create_wallet_keyboard(session: AsyncSession, state=None, exclude_wall
     Returns:
         InlineKeyboardMarkup с кнопками вида [<wallet_number>].
     """
-    wallets = await get_wallets(session)  # type: List[Wallet]
+    wallets = await get_wallets_cached(session)  # type: List[Wallet]
+    with_back = state is not None and bool(await state.get_state())
+
+    cache_key = (exclude_wallet or None, with_back)
+    cached = _markup_cache.get(cache_key)
+    if cached is not None and cached[0] is wallets:
+        return cached[1]
 
-    if exclude_wallet:
-        wallets = [w for w in wallets if w.wallet_id != exclude_wallet]
+    shown = [w for w in wallets if w.wallet_id != exclude_wallet] if exclude_wallet else wallets
 
     # Формируем кортежи (текст, raw_callback_data, CallbackData)
     items: List[Tuple[str, str, WalletCallback]] = [
@@ -47,7 +59,9 @@ async def create_wallet_keyboard(session: AsyncSession, state=None, exclude_wall
             w.wallet_id,
             WalletCallback(wallet_id=w.wallet_id),
         )
-        for w in wallets
+        for w in shown
     ]
 
-    return await build_inline_keyboard(items, state=state)
+    markup = await build_inline_keyboard(items, state=state if with_back else None)
+    _markup_cache[cache_key] = (wallets, markup)
+    return markup
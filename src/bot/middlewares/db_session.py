@@ -0,0 +1,26 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.db import get_async_session
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """Одна `AsyncSession` на апдейт: хендлер и его помощники получают её как `session`.
+
+    Соединение из пула берётся лениво — при первом запросе, поэтому апдейты,
+    обслуженные из кэша, пул не трогают. Commit/rollback — в `get_async_session`.
+    Хендлер, закончивший работу с БД, сам вызывает `session.commit()` перед
+    запросами к Bot API, чтобы соединение не простаивало в транзакции.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with get_async_session() as session:
+            data["session"] = session
+            return await handler(event, data)
@@ -4,7 +4,7 @@ from aiogram import BaseMiddleware
 from aiogram.fsm.context import FSMContext
 from aiogram.types import TelegramObject
 
-from src.core.logger import configure_logger
+from src.core.logger import configure_logger, is_level_enabled
 
 
 class StateLoggerMiddleware(BaseMiddleware):
@@ -21,18 +21,23 @@ class StateLoggerMiddleware(BaseMiddleware):
         user_id = getattr(event.from_user, "id", "unknown")
 
         if state is None:
-            self.logger.warning(f"User {user_id}: no FSMContext, skipping logging.")
+            self.logger.warning("User {}: no FSMContext, skipping logging.", user_id)
             return await handler(event, data)
 
-        # читаем текущее состояние и данные
-        current_state = await state.get_state()
-        state_name = current_state.split(":")[-1] if current_state else "None"
-
-        payload = await state.get_data()
-        payload_str = ", ".join(f"{k}={v}" for k, v in payload.items() if v is not None)
-
-        # self.logger.info(
-        #     f"User {user_id}: Current state = {state_name}, Data = {{{payload_str}}}"
-        # )
+        # дамп состояния — два чтения из хранилища на каждый апдейт,
+        # поэтому только при включённом DEBUG
+        if is_level_enabled(self.logger, "DEBUG"):
+            current_state = await state.get_state()
+            state_name = current_state.split(":")[-1] if current_state else "None"
+
+            payload = await state.get_data()
+            payload_str = ", ".join(f"{k}={v}" for k, v in payload.items() if v is not None)
+
+            self.logger.debug(
+                "User {}: Current state = {}, Data = {{{}}}",
+                user_id,
+                state_name,
+                payload_str,
+            )
 
         return await handler(event, data)              # не забываем пропускать дальше
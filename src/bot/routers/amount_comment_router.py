@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from typing import Final
 
@@ -34,6 +35,15 @@ MSG_ENTER_COMMENT:  Final = "Добавьте комментарий к опер
 router: Final = Router()
 log = configure_logger(prefix="AMT/CMNT", color="yellow", level="INFO")
 
+# ─────────────────────────── ВСПОМОГАТЕЛЬНОЕ ─────────────────────────────
+async def _confirm_in_prompt(bot: Bot, msg: Message, prompt_id: int, text: str) -> None:
+    """Пишет подтверждение в сообщение‑запрос; не вышло — отдельным сообщением."""
+    try:
+        await bot.edit_message_text(chat_id=msg.chat.id, message_id=prompt_id, text=text)
+    except Exception as err:  # noqa: BLE001
+        log.error("Ошибка при редактировании сообщения {}: {}", prompt_id, err)
+        await msg.answer(text)
+
 # ───────────────────────── ШАГ 7: СУММА ──────────────────────────────────
 @router.message(OperationState.entering_operation_amount)
 @track_messages
@@ -51,28 +61,26 @@ async def handle_amount(msg: Message, state: FSMContext, bot: Bot) -> None:
         await msg.answer(MSG_INVALID_AMOUNT)
         return
 
-    await state.update_data(operation_amount=amount)
-    log.info(f"Юзер {msg.from_user.full_name}: введена сумма – {amount}")
-
+    # track_messages записал в amount_message_id ответ юзера; id промпта
+    # лежит отдельно — возвращаем его на место одной записью
     data = await state.get_data()
-    amount_prompt_id = data.get("amount_message_id") - 1
-    await state.update_data(amount_message_id=amount_prompt_id)
+    amount_prompt_id = data.get("amount_prompt_id")
+    data.update(operation_amount=amount, amount_message_id=amount_prompt_id)
+    await state.set_data(data)
+    log.info("Юзер {}: введена сумма – {}", msg.from_user.full_name, amount)
 
-    # подтверждение в оригинальном сообщении
+    # подтверждение в оригинальном сообщении (параллельно с удалением ответа юзера)
     if amount_prompt_id:
         confirm_text = MSG_CONFIRM_AMOUNT.format(amount=amount)
-        try:
-            await bot.edit_message_text(
-                chat_id=msg.chat.id,
-                message_id=amount_prompt_id,
-                text=confirm_text,
-                parse_mode="HTML",
-            )
-        except Exception as err:  # noqa: BLE001
-            log.error(f"Ошибка при редактировании сообщения {amount_prompt_id}: {err}")
-            await msg.answer(confirm_text, parse_mode="HTML")
-
-    await msg.delete()
+        # запрос суммы был совмещён со сводкой — сохраняем её над подтверждением
+        if amount_prompt_id == data.get("summary_message_id") and data.get("summary_text"):
+            confirm_text = f"{data['summary_text']}\n\n{confirm_text}"
+        await asyncio.gather(
+            _confirm_in_prompt(bot, msg, amount_prompt_id, confirm_text),
+            msg.delete(),
+        )
+    else:
+        await msg.delete()
 
     # нужно ли спрашивать saving_coeff?
     op_type = data.get("operation_type")
@@ -101,25 +109,18 @@ async def handle_saving_coeff(msg: Message, state: FSMContext, bot: Bot) -> None
         await msg.answer(MSG_INVALID_COEFF)
         return
 
-    await state.update_data(saving_coeff=coeff)
-    log.info(f"Юзер {msg.from_user.full_name}: коэффициент экономии – {coeff}")
+    data = await state.update_data(saving_coeff=coeff)
+    log.info("Юзер {}: коэффициент экономии – {}", msg.from_user.full_name, coeff)
 
     # подтверждаем
-    data = await state.get_data()
-    coeff_prompt_id = data.get("coeff_message_id", msg.message_id - 1)
+    coeff_prompt_id = data.get("coeff_message_id")
     if coeff_prompt_id:
-        try:
-            await bot.edit_message_text(
-                chat_id=msg.chat.id,
-                message_id=coeff_prompt_id,
-                text=MSG_CONFIRM_COEFF.format(coeff=coeff),
-                parse_mode="HTML",
-            )
-        except Exception as err:  # noqa: BLE001
-            log.error(f"Ошибка при редактировании сообщения {coeff_prompt_id}: {err}")
-            await msg.answer(MSG_CONFIRM_COEFF.format(coeff=coeff), parse_mode="HTML")
-
-    await msg.delete()
+        await asyncio.gather(
+            _confirm_in_prompt(bot, msg, coeff_prompt_id, MSG_CONFIRM_COEFF.format(coeff=coeff)),
+            msg.delete(),
+        )
+    else:
+        await msg.delete()
 
     # переходим к комментарию
     comment_msg = await bot.send_message(msg.chat.id, MSG_ENTER_COMMENT)
@@ -36,7 +36,7 @@ from src.bot.keyboards.calendar.custom_calendar import (
 from src.bot.keyboards.calendar.schemas import CustomCalAct
 from src.bot.keyboards.wallet_kb import create_wallet_keyboard
 from src.bot.routers.outcome.outcome_router import (
-    _dict_kb, MSG_INDICATE_SOURCE, _kb_source,
+    _dict_kb, MSG_INDICATE_SOURCE, KB_SOURCE,
 )
 from src.bot.routers.transfer.transfer_router import _get_choose_from_wallet_message
 from src.bot.state import OperationState, reset_state
@@ -91,7 +91,7 @@ async def start_operation(msg: Message, state: FSMContext, bot: Bot) -> None:
     iso_now = datetime.now(tz=timezone.utc).isoformat(timespec="seconds")
     await state.update_data(recording_date=iso_now, state_history=[])
 
-    log.info(f"Юзер {msg.from_user.full_name}: started operation input wizard")
+    log.info("Юзер {}: started operation input wizard", msg.from_user.full_name)
 
     text, kb = await _get_choose_operation_date_message(state)
     cal_msg = await msg.answer(text, reply_markup=kb)
@@ -99,7 +99,7 @@ async def start_operation(msg: Message, state: FSMContext, bot: Bot) -> None:
     await state.set_state(OperationState.choosing_operation_date)
 
 # ─────────────────────────── ВЫБОР ДАТЫ ОПЕРАЦИИ ──────────────────────────────
-@router.callback_query(F.data.startswith("custom_calendar"), OperationState.choosing_operation_date)
+@router.callback_query(OperationState.choosing_operation_date, F.data.startswith("custom_calendar"))
 @track_messages
 async def choose_op_date(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
     """Выбор даты операции пользователем."""
@@ -120,7 +120,7 @@ async def choose_op_date(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None
             state_history=[OperationState.choosing_operation_date.state],
         )
 
-        log.info(f"Юзер {cb.from_user.full_name}: выбрана дата операции – {op_date}")
+        log.info("Юзер {}: выбрана дата операции – {}", cb.from_user.full_name, op_date)
 
         confirm_text = MSG_CONFIRM_OP_DATE.format(op_date)
         await cb.message.edit_text(confirm_text, reply_markup=None)
@@ -133,7 +133,7 @@ async def choose_op_date(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None
     await cb.answer()
 
 # ─────────────────────────── ВЫБОР ТИПА ОПЕРАЦИИ ──────────────────────────────
-@router.callback_query(F.data.startswith("operation_type"), OperationState.choosing_operation_type)
+@router.callback_query(OperationState.choosing_operation_type, F.data.startswith("operation_type"))
 @track_messages
 async def set_operation_type(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
     """Выбор типа операции (Поступление / Перемещение / Выбытие)."""
@@ -143,7 +143,7 @@ async def set_operation_type(cb: CallbackQuery, state: FSMContext, bot: Bot) ->
         state_history=[OperationState.choosing_operation_type.state],
     )
 
-    log.info(f"Юзер {cb.from_user.full_name}: выбран тип операции – {op_type}")
+    log.info("Юзер {}: выбран тип операции – {}", cb.from_user.full_name, op_type)
 
     if op_type == "Поступление":
         text, kb = await _dict_kb(state, create_wallet_keyboard, OperationState.choosing_income_wallet)
@@ -152,7 +152,7 @@ async def set_operation_type(cb: CallbackQuery, state: FSMContext, bot: Bot) ->
         text, kb = await _get_choose_from_wallet_message(cb, state)
         await state.set_state(OperationState.choosing_from_wallet)
     elif op_type == "Выбытие":
-        text, kb = MSG_INDICATE_SOURCE, _kb_source()
+        text, kb = MSG_INDICATE_SOURCE, KB_SOURCE
         await state.set_state(OperationState.choosing_outcome_wallet_or_creditor)
     else:
         raise ValueError(f"Неизвестный тип операции: {op_type}")
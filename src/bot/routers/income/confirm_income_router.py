@@ -4,29 +4,34 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Final
 
 from aiogram import Bot, F, Router
 from aiogram.filters import BaseFilter, StateFilter
 from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
-from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
 
 from src.bot.state import OperationState, reset_state
 from src.bot.utils.legacy_messages import (
-    delete_key_messages,
-    delete_tracked_messages,
+    delete_operation_messages,
     track_messages,
 )
 from src.core.logger import configure_logger
 from src.db import (
     create_income,
     get_async_session,
-    get_wallet,
-    get_project,
-    get_creditor,
-    get_founder, get_article,
+    get_wallet_cached,
+    get_project_cached,
+    get_creditor_cached,
+    get_founder_cached,
+    get_article_cached,
 )
 
 # ─────────────────────────────── UI‑КОНСТАНТЫ ──────────────────────────────
@@ -38,6 +43,9 @@ EMOJI_REPEAT:  Final = "🔄"
 BTN_CONFIRM_TEXT: Final = f"{EMOJI_CONFIRM} Подтвердить"
 BTN_CANCEL_TEXT:  Final = f"{EMOJI_CANCEL} Отклонить"
 
+# Разделитель тысяч в сумме: «,» → пробел
+_AMT_SEP: Final = " "
+
 MSG_OPERATION_PROMPT: Final = (
     "Подтвердите операцию:\n{info}\n\n"
     f"Нажмите кнопку: {EMOJI_CONFIRM}"
@@ -62,13 +70,15 @@ class IncomeConfirmCallback(CallbackData, prefix="confirm-income"):
     """CallbackData для YES/NO кнопок."""
     action: str  # "yes" | "no"
 
+# Payload'ы кнопок постоянны — упаковываем один раз при импорте
+CB_YES: Final = IncomeConfirmCallback(action="yes").pack()
+CB_NO:  Final = IncomeConfirmCallback(action="no").pack()
+
 # ──────────────────────────── Клавиатура ─────────────────────────────────
-def create_confirm_keyboard() -> InlineKeyboardBuilder:
-    kb = InlineKeyboardBuilder()
-    kb.button(text=BTN_CONFIRM_TEXT, callback_data=IncomeConfirmCallback(action="yes").pack())
-    kb.button(text=BTN_CANCEL_TEXT,  callback_data=IncomeConfirmCallback(action="no").pack())
-    kb.adjust(2)
-    return kb.as_markup()
+CONFIRM_MARKUP: Final = InlineKeyboardMarkup(inline_keyboard=[[
+    InlineKeyboardButton(text=BTN_CONFIRM_TEXT, callback_data=CB_YES),
+    InlineKeyboardButton(text=BTN_CANCEL_TEXT,  callback_data=CB_NO),
+]])
 
 # ───────────────────── Формирование сводки ──────────────────────────────
 async def format_operation_message(data: dict) -> str:
@@ -80,25 +90,25 @@ async def format_operation_message(data: dict) -> str:
     op_date     = data.get("operation_date", "Не выбрано")
 
     async with get_async_session() as session:
-        wallet   = await get_wallet(session, wallet_id)
+        wallet   = await get_wallet_cached(session, wallet_id)
         w_num    = wallet.wallet_number if wallet else wallet_id
 
-        artical_name = (await get_article(session, article_id)).name
+        artical_name = (await get_article_cached(session, article_id)).name
 
         # доп‑инфо (проект / кредитор / учредитель)
         extra = ""
         if data.get("income_project"):
-            project = await get_project(session, data["income_project"])
+            project = await get_project_cached(session, data["income_project"])
             extra   = f"🏗️ Проект: <b>{project.name if project else data['income_project']}</b>\n"
         elif data.get("income_creditor"):
-            cred    = await get_creditor(session, data["income_creditor"])
+            cred    = await get_creditor_cached(session, data["income_creditor"])
             extra   = f"🤝 Кредитор: <b>{cred.name if cred else data['income_creditor']}</b>\n"
         elif data.get("income_founder"):
-            founder = await get_founder(session, data["income_founder"])
+            founder = await get_founder_cached(session, data["income_founder"])
             extra   = f"🏢 Учредитель: <b>{founder.name if founder else data['income_founder']}</b>\n"
 
     # Красивое форматирование суммы (2 знака, пробел‑разделитель тысяч)
-    amount_str = f"{amount:,.2f}".replace(',', ' ')  # не‑breakable space
+    amount_str = f"{amount:,.2f}".replace(",", _AMT_SEP)
 
     return (
         f"🟩 <b>Поступление</b> | Дата: <code>{op_date}</code>\n"
@@ -121,39 +131,38 @@ class IncomeOperationFilter(BaseFilter):
     StateFilter(OperationState.entering_operation_comment),
     IncomeOperationFilter(),
 )
-@track_messages
 async def handle_comment(msg: Message, state: FSMContext, bot: Bot) -> None:
     """Принимаем комментарий, показываем сводку с кнопками YES/NO."""
     comment = (msg.text or "").strip()
-    await state.update_data(operation_comment=comment)
-    log.info(f"Юзер {msg.from_user.full_name}: введён комментарий")
+    data = await state.update_data(operation_comment=comment)
+    log.info("Юзер {}: введён комментарий", msg.from_user.full_name)
 
-    data = await state.get_data()
     chat_id = msg.chat.id
 
-    # чистим предыдущие сообщения
-    await msg.delete()
-    await bot.delete_message(chat_id, data.get("comment_message_id") - 1)
-    await bot.delete_message(chat_id, data.get("date_message_id"))
-    await delete_tracked_messages(bot, state, chat_id)
-    await delete_key_messages(bot, state, chat_id)
+    # чистим предыдущие сообщения параллельно с рендером сводки
+    cleanup = asyncio.gather(
+        msg.delete(),
+        bot.delete_message(chat_id, data.get("comment_message_id")),
+        bot.delete_message(chat_id, data.get("date_message_id")),
+        delete_operation_messages(bot, state, chat_id),
+        return_exceptions=True,
+    )
+    _, info = await asyncio.gather(cleanup, format_operation_message(data))
 
     # отправляем подтверждение
-    info = await format_operation_message(data)
     msg = str(MSG_OPERATION_PROMPT.format(info=info))
     sent = await bot.send_message(
         chat_id=chat_id,
         text=msg,
-        reply_markup=create_confirm_keyboard(),
-        parse_mode="HTML"
+        reply_markup=CONFIRM_MARKUP,
     )
     await state.update_data(confirm_message_id=sent.message_id)
     await state.set_state(OperationState.confirming_operation)
 
 # ─────────────────────── ПОДТВЕРЖДЕНИЕ (YES) ────────────────────────────
 @router.callback_query(
-    IncomeConfirmCallback.filter(F.action == "yes"),
     OperationState.confirming_operation,
+    IncomeConfirmCallback.filter(F.action == "yes"),
 )
 @track_messages
 async def confirm_yes(
@@ -166,7 +175,7 @@ async def confirm_yes(
     chat_id, message_id = cb.message.chat.id, cb.message.message_id
     info = await format_operation_message(data)
 
-    log.info(f"Юзер {cb.from_user.full_name}: подтвердил приход")
+    log.info("Юзер {}: подтвердил приход", cb.from_user.full_name)
 
     try:
         async with get_async_session() as session:
@@ -185,37 +194,40 @@ async def confirm_yes(
             income_obj = await create_income(session, income_data)
 
             log.info(
-                f"Создан Income {income_obj.transaction_id} – "
-                f"Дата: {income_obj.operation_date}, "
-                f"Кошелёк: {income_obj.income_wallet}, "
-                f"Сумма: {income_obj.operation_amount}"
+                "Создан Income {} – "
+                "Дата: {}, "
+                "Кошелёк: {}, "
+                "Сумма: {}",
+                income_obj.transaction_id,
+                income_obj.operation_date,
+                income_obj.income_wallet,
+                income_obj.operation_amount,
             )
 
-        await bot.edit_message_text(
-            chat_id=chat_id,
-            message_id=message_id,
-            text=MSG_INCOME_SUCCESS.format(info=info),
-            parse_mode="HTML",
+        await asyncio.gather(
+            bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=MSG_INCOME_SUCCESS.format(info=info),
+            ),
+            reset_state(state),
         )
         await bot.send_message(chat_id, MSG_NEXT_STEP)
-        await reset_state(state)
     except Exception as err:  # noqa: BLE001
-        log.error(f"Ошибка при добавлении поступления: {err}")
+        log.error("Ошибка при добавлении поступления: {}", err)
         await bot.edit_message_text(
             chat_id=chat_id,
             message_id=message_id,
             text=MSG_INCOME_ERROR.format(info=info, error=err),
-            parse_mode="HTML",
         )
 
     await cb.answer()
 
 # ───────────────────────── ОТКЛОНЕНИЕ (NO) ──────────────────────────────
 @router.callback_query(
-    IncomeConfirmCallback.filter(F.action == "no"),
     OperationState.confirming_operation,
+    IncomeConfirmCallback.filter(F.action == "no"),
 )
-@track_messages
 async def confirm_no(
     cb: CallbackQuery,
     state: FSMContext,
@@ -226,17 +238,18 @@ async def confirm_no(
     chat_id, message_id = cb.message.chat.id, cb.message.message_id
     info = await format_operation_message(data)
 
-    log.info(f"Юзер {cb.from_user.full_name}: отменил приход")
-
-    await delete_tracked_messages(bot, state, chat_id)
-    await delete_key_messages(bot, state, chat_id)
+    log.info("Юзер {}: отменил приход", cb.from_user.full_name)
 
-    await bot.edit_message_text(
-        chat_id=chat_id,
-        message_id=message_id,
-        text=MSG_INCOME_CANCEL.format(info=info),
-        parse_mode="HTML",
+    await asyncio.gather(
+        delete_operation_messages(bot, state, chat_id, exclude_message_id=message_id),
+        bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=MSG_INCOME_CANCEL.format(info=info),
+        ),
+    )
+    await asyncio.gather(
+        bot.send_message(chat_id, MSG_NEXT_STEP),
+        reset_state(state),
+        cb.answer(),
     )
-    await bot.send_message(chat_id, MSG_NEXT_STEP)
-    await reset_state(state)
-    await cb.answer()
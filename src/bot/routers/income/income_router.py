@@ -9,7 +9,6 @@ from typing import Final, Tuple
 from aiogram import Bot, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.bot.keyboards.article_kb import create_article_keyboard, ArticleCallback
 from src.bot.keyboards.creditor_kb import create_creditor_keyboard, CreditorCallback
@@ -21,11 +20,11 @@ from src.bot.utils.legacy_messages import track_messages
 from src.core.logger import configure_logger
 from src.db import (
     get_async_session,
-    get_articles,
-    get_wallet,
-    get_project,
-    get_creditor,
-    get_founder,
+    get_articles_cached,
+    get_wallet_cached,
+    get_project_cached,
+    get_creditor_cached,
+    get_founder_cached,
 )
 
 # ─────────────────────────── КОНСТАНТЫ UI ──────────────────────────────
@@ -65,18 +64,17 @@ async def _choose_income_article_msg(
     async with get_async_session() as session:
         kb = await create_article_keyboard(session, state=state, operation_type="Поступление")
 
-        wallet_id = (await state.get_data()).get("income_wallet")
-        if wallet_id:
-            wallet = await get_wallet(session, wallet_id)
-            wallet_number = wallet.wallet_number if wallet else wallet_id
-            text = f"Выбран кошелёк: <b>{wallet_number}</b>\n{MSG_CHOOSE_ARTICLE}"
-        else:
-            text = MSG_CHOOSE_ARTICLE
+    # номер кошелька сохранён в state при выборе — повторно в БД не ходим
+    wallet_number = (await state.get_data()).get("income_wallet_label")
+    if wallet_number:
+        text = f"Выбран кошелёк: <b>{wallet_number}</b>\n{MSG_CHOOSE_ARTICLE}"
+    else:
+        text = MSG_CHOOSE_ARTICLE
 
     return text, kb
 
 # ─────────────────────── ВЫБОР КОШЕЛЬКА ПРИХОДА ──────────────────────
-@router.callback_query(WalletCallback.filter(), OperationState.choosing_income_wallet)
+@router.callback_query(OperationState.choosing_income_wallet, WalletCallback.filter())
 @track_messages
 async def set_income_wallet(
     cb: CallbackQuery,
@@ -86,16 +84,20 @@ async def set_income_wallet(
 ) -> None:
     wallet_id = callback_data.wallet_id
     async with get_async_session() as session:
-        wallet = await get_wallet(session, wallet_id)
+        wallet = await get_wallet_cached(session, wallet_id)
         wallet_number = wallet.wallet_number if wallet else wallet_id
 
     await state.update_data(
         income_wallet=wallet_id,
+        income_wallet_label=wallet_number,
         state_history=[OperationState.choosing_income_wallet.state],
     )
     log.info(
-        f"Юзер {cb.from_user.full_name}: выбран income_wallet – {wallet_id}, "
-        f"кошелёк – {wallet_number}"
+        "Юзер {}: выбран income_wallet – {}, "
+        "кошелёк – {}",
+        cb.from_user.full_name,
+        wallet_id,
+        wallet_number,
     )
 
     # Отправляем сообщение с выбором статьи
@@ -108,7 +110,7 @@ async def set_income_wallet(
     await cb.message.delete()
 
 # ─────────────────────── ВЫБОР СТАТЬИ ПРИХОДА ────────────────────────
-@router.callback_query(ArticleCallback.filter(), OperationState.choosing_income_article)
+@router.callback_query(OperationState.choosing_income_article, ArticleCallback.filter())
 @track_messages
 async def set_income_article(
     cb: CallbackQuery,
@@ -117,29 +119,29 @@ async def set_income_article(
     callback_data: ArticleCallback,  # noqa: ARG001
 ) -> None:
     article_id = callback_data.article_id
-    await state.update_data(
+    data = await state.update_data(
         income_article=article_id,
         state_history=[OperationState.choosing_income_article.state],
     )
-    log.info(f"Юзер {cb.from_user.full_name}: выбрана income_article – {article_id}")
+    log.info("Юзер {}: выбрана income_article – {}", cb.from_user.full_name, article_id)
 
     async with get_async_session() as session:
-        # данные статьи и кошелька
-        articles = await get_articles(session)
+        # данные статьи
+        articles = await get_articles_cached(session)
         article = next((a for a in articles if a.article_id == article_id), None)
-        wallet_id = (await state.get_data()).get("income_wallet")
-        wallet = await get_wallet(session, wallet_id) if wallet_id else None
-        wallet_number = wallet.wallet_number if wallet else wallet_id or "Не выбрано"
         article_text = (
             f"№{article.code} {article.short_name}" if article else str(article_id)
         )
 
     # подтверждаем выбор
+    wallet_number = (
+        data.get("income_wallet_label") or data.get("income_wallet") or "Не выбрано"
+    )
     confirm_text = (
         f"Выбран кошелёк: <b>{wallet_number}</b>\n"
         f"Выбрана статья прихода:\n✅ <b>{article_text}</b>"
     )
-    await cb.message.edit_text(confirm_text, parse_mode="HTML", reply_markup=None)
+    await cb.message.edit_text(confirm_text, reply_markup=None)
 
     # определяем следующий шаг
     async with get_async_session() as session:
@@ -165,6 +167,7 @@ async def set_income_article(
     await state.update_data(
         additional_info_message_id=msg.message_id if kb else None,
         amount_message_id=msg.message_id if not kb else None,
+        amount_prompt_id=msg.message_id if not kb else None,
     )
     await state.set_state(next_state)
     await cb.answer()
@@ -184,18 +187,18 @@ async def _handle_entity(
         entity_name = entity.name if entity else entity_id
 
     await state.update_data(**{state_key: entity_id})
-    log.info(f"Юзер {cb.from_user.full_name}: выбран {state_key} – {entity_id}")
+    log.info("Юзер {}: выбран {} – {}", cb.from_user.full_name, state_key, entity_id)
 
     confirm_text = f"Выбран {label.lower()}:\n✅ <b>{entity_name}</b>"
-    await cb.message.edit_text(confirm_text, parse_mode="HTML", reply_markup=None)
+    await cb.message.edit_text(confirm_text, reply_markup=None)
 
     msg = await bot.send_message(cb.message.chat.id, MSG_ENTER_AMOUNT)
-    await state.update_data(amount_message_id=msg.message_id)
+    await state.update_data(amount_message_id=msg.message_id, amount_prompt_id=msg.message_id)
     await state.set_state(OperationState.entering_operation_amount)
     await cb.answer()
 
 
-@router.callback_query(ProjectCallback.filter(), OperationState.choosing_income_project)
+@router.callback_query(OperationState.choosing_income_project, ProjectCallback.filter())
 @track_messages
 async def set_income_project(
     cb: CallbackQuery,
@@ -205,11 +208,11 @@ async def set_income_project(
 ) -> None:
     await _handle_entity(
         cb, state, bot, callback_data.project_id,
-        PROJECT_LABEL, get_project, "income_project"
+        PROJECT_LABEL, get_project_cached, "income_project"
     )
 
 
-@router.callback_query(CreditorCallback.filter(), OperationState.choosing_income_creditor)
+@router.callback_query(OperationState.choosing_income_creditor, CreditorCallback.filter())
 @track_messages
 async def set_income_creditor(
     cb: CallbackQuery,
@@ -219,11 +222,11 @@ async def set_income_creditor(
 ) -> None:
     await _handle_entity(
         cb, state, bot, callback_data.creditor_id,
-        CREDITOR_LABEL, get_creditor, "income_creditor"
+        CREDITOR_LABEL, get_creditor_cached, "income_creditor"
     )
 
 
-@router.callback_query(FounderCallback.filter(), OperationState.choosing_income_founder)
+@router.callback_query(OperationState.choosing_income_founder, FounderCallback.filter())
 @track_messages
 async def set_income_founder(
     cb: CallbackQuery,
@@ -233,7 +236,7 @@ async def set_income_founder(
 ) -> None:
     await _handle_entity(
         cb, state, bot, callback_data.founder_id,
-        FOUNDER_LABEL, get_founder, "income_founder"
+        FOUNDER_LABEL, get_founder_cached, "income_founder"
     )
 
 # ─────────────────── ВВОД ДОПОЛНИТЕЛЬНОЙ ИНФО ───────────────────────────
@@ -246,9 +249,12 @@ async def set_income_additional_info(
 ) -> None:
     info = msg.text.strip() or None
     await state.update_data(income_additional_info=info)
-    log.info(f"Юзер {msg.from_user.full_name}: введена дополнительная инфо – {info}")
+    log.info("Юзер {}: введена дополнительная инфо – {}", msg.from_user.full_name, info)
 
     await msg.delete()
     msg_amount = await bot.send_message(msg.chat.id, MSG_ENTER_AMOUNT)
-    await state.update_data(amount_message_id=msg_amount.message_id)
+    await state.update_data(
+        amount_message_id=msg_amount.message_id,
+        amount_prompt_id=msg_amount.message_id,
+    )
     await state.set_state(OperationState.entering_operation_amount)
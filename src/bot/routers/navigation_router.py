@@ -27,7 +27,7 @@ from src.bot.routers.outcome.outcome_router import (
     _msg_choose_project as get_choose_outcome_project_message,
     _msg_choose_general_type as get_choose_outcome_general_type_message,
     _msg_choose_article,
-    MSG_INDICATE_SOURCE, _kb_source, MSG_CHOOSE_CHAPTER, _kb_chapter,
+    MSG_INDICATE_SOURCE, KB_SOURCE, MSG_CHOOSE_CHAPTER, KB_CHAPTER,
 )
 from src.bot.routers.transfer.transfer_router import (
     _get_choose_from_wallet_message,
@@ -42,6 +42,36 @@ from src.core.logger import configure_logger
 router = Router()
 log = configure_logger(prefix="NAV", color="blue", level="INFO")
 
+# ─────────────────────── СТРОКИ СОСТОЯНИЙ ────────────────────────────
+S_OP_DATE          = OperationState.choosing_operation_date.state
+S_OP_TYPE          = OperationState.choosing_operation_type.state
+S_INCOME_WALLET    = OperationState.choosing_income_wallet.state
+S_INCOME_ARTICLE   = OperationState.choosing_income_article.state
+S_INCOME_PROJECT   = OperationState.choosing_income_project.state
+S_INCOME_CREDITOR  = OperationState.choosing_income_creditor.state
+S_INCOME_FOUNDER   = OperationState.choosing_income_founder.state
+S_INCOME_ADD_INFO  = OperationState.choosing_income_additional_info.state
+S_FROM_WALLET      = OperationState.choosing_from_wallet.state
+S_TO_WALLET        = OperationState.choosing_to_wallet.state
+S_OUT_SOURCE       = OperationState.choosing_outcome_wallet_or_creditor.state
+S_OUT_WALLET       = OperationState.choosing_outcome_wallet.state
+S_OUT_CREDITOR     = OperationState.choosing_outcome_creditor.state
+S_OUT_CHAPTER      = OperationState.choosing_outcome_chapter.state
+S_OUT_PROJECT      = OperationState.choosing_outcome_project.state
+S_OUT_GENERAL_TYPE = OperationState.choosing_outcome_general_type.state
+S_OUT_ARTICLE      = OperationState.choosing_outcome_article.state
+S_CONTRACTOR       = OperationState.choosing_contractor.state
+S_MATERIAL         = OperationState.choosing_material.state
+S_EMPLOYEE         = OperationState.choosing_employee.state
+S_CREDITOR         = OperationState.choosing_creditor.state
+S_FOUNDER          = OperationState.choosing_founder.state
+S_OUT_DETAILS      = OperationState.entering_outcome_details.state
+S_AMOUNT           = OperationState.entering_operation_amount.state
+
+# Шаги уточнения статьи (ст.3, 4, 7/8/11, 29, 30) и доп‑инфо прихода
+S_ARTICLE_DETAILS = frozenset({S_CONTRACTOR, S_MATERIAL, S_EMPLOYEE, S_CREDITOR, S_FOUNDER})
+S_INCOME_EXTRA    = frozenset({S_INCOME_PROJECT, S_INCOME_CREDITOR, S_INCOME_FOUNDER, S_INCOME_ADD_INFO})
+
 
 @router.callback_query(lambda cb: cb.data == "nav:back")
 async def process_back_navigation(cb: CallbackQuery, state: FSMContext, bot: Bot):
@@ -64,96 +94,89 @@ async def process_back_navigation(cb: CallbackQuery, state: FSMContext, bot: Bot
         data.get("general_type_message_id"),
     ])
 
-    prev_state = state_history.pop()
+    prev_state = state_history[-1]
     current_state = await state.get_state()
 
-    if current_state == OperationState.choosing_to_wallet.state:
+    if current_state == S_TO_WALLET:
         await state.update_data(to_wallet=None)
-    elif current_state == OperationState.entering_operation_amount.state:
+    elif current_state == S_AMOUNT:
         await state.update_data(operation_amount=None)
-    elif current_state in [
-        OperationState.choosing_income_project.state,
-        OperationState.choosing_income_creditor.state,
-        OperationState.choosing_income_founder.state,
-        OperationState.choosing_income_additional_info.state,
-    ]:
+    elif current_state in S_INCOME_EXTRA:
         await state.update_data(income_project=None, income_creditor=None, income_founder=None,
                                 income_additional_info=None)
-    elif current_state == OperationState.choosing_income_wallet.state:
+    elif current_state == S_INCOME_WALLET:
         await state.update_data(income_wallet=None)
-    elif current_state == OperationState.choosing_income_article.state:
+    elif current_state == S_INCOME_ARTICLE:
         await state.update_data(income_article=None)
-    elif current_state == OperationState.choosing_outcome_project.state:
+    elif current_state == S_OUT_PROJECT:
         await state.update_data(outcome_chapter=None)
-    elif current_state == OperationState.choosing_outcome_general_type.state:
+    elif current_state == S_OUT_GENERAL_TYPE:
         await state.update_data(outcome_general_type=None)
-    elif current_state == OperationState.choosing_outcome_article.state:
+    elif current_state == S_OUT_ARTICLE:
         await state.update_data(outcome_article=None)
-    elif current_state == OperationState.entering_outcome_details.state:
+    elif current_state == S_OUT_DETAILS:
         await state.update_data(employee_name=None, material_name=None, contractor_name=None,
                                 outcome_article_creditor=None, outcome_founder=None)
-    elif current_state == OperationState.choosing_outcome_wallet_or_creditor.state:
+    elif current_state == S_OUT_SOURCE:
         await state.update_data(outcome_wallet=None, outcome_creditor=None)
-    elif current_state == OperationState.choosing_outcome_wallet.state:
+    elif current_state == S_OUT_WALLET:
         await state.update_data(outcome_wallet=None)
-    elif current_state == OperationState.choosing_outcome_creditor.state:
+    elif current_state == S_OUT_CREDITOR:
         await state.update_data(outcome_creditor=None)
-    elif current_state == OperationState.choosing_contractor.state:
+    elif current_state == S_CONTRACTOR:
         await state.update_data(contractor_name=None)
-    elif current_state == OperationState.choosing_material.state:
+    elif current_state == S_MATERIAL:
         await state.update_data(material_name=None)
-    elif current_state == OperationState.choosing_employee.state:
+    elif current_state == S_EMPLOYEE:
         await state.update_data(employee_name=None)
-    elif current_state == OperationState.choosing_creditor.state:
+    elif current_state == S_CREDITOR:
         await state.update_data(outcome_article_creditor=None)
-    elif current_state == OperationState.choosing_founder.state:
+    elif current_state == S_FOUNDER:
         await state.update_data(outcome_founder=None)
 
-    await state.update_data(state_history=state_history)
+    await state.update_data(state_history=state_history[:-1])
     await state.set_state(prev_state)
 
-    if prev_state == OperationState.choosing_operation_date.state:
+    if prev_state == S_OP_DATE:
         text, kb = await _get_choose_operation_date_message(state)
         message_id = data.get("date_message_id")
-    elif prev_state == OperationState.choosing_operation_type.state:
+    elif prev_state == S_OP_TYPE:
         text, kb = await _get_choose_operation_type_message()
         message_id = data.get("type_message_id")
-    elif prev_state == OperationState.choosing_income_wallet.state:
+    elif prev_state == S_INCOME_WALLET:
         text, kb = await _choose_income_wallet_msg()
         message_id = data.get("income_wallet_message_id")
-    elif prev_state == OperationState.choosing_income_article.state:
+    elif prev_state == S_INCOME_ARTICLE:
         text, kb = await _choose_income_article_msg(state)
         message_id = data.get("article_message_id")
-    elif prev_state == OperationState.choosing_from_wallet.state:
+    elif prev_state == S_FROM_WALLET:
         text, kb = await _get_choose_from_wallet_message(cb, state)
         message_id = None
-    elif prev_state == OperationState.choosing_to_wallet.state:
+    elif prev_state == S_TO_WALLET:
         text, kb = await _get_choose_to_wallet_message(cb, state)
         message_id = None
-    elif prev_state == OperationState.choosing_outcome_wallet_or_creditor.state:
-        text, kb = MSG_INDICATE_SOURCE, _kb_source()
+    elif prev_state == S_OUT_SOURCE:
+        text, kb = MSG_INDICATE_SOURCE, KB_SOURCE
         message_id = data.get("outcome_source_message_id")
-    elif prev_state == OperationState.choosing_outcome_wallet.state:
+    elif prev_state == S_OUT_WALLET:
         text, kb = await _dict_kb(state, create_wallet_keyboard, OperationState.choosing_outcome_wallet)
         message_id = data.get("outcome_source_message_id")
-    elif prev_state == OperationState.choosing_outcome_creditor.state:
+    elif prev_state == S_OUT_CREDITOR:
         text, kb = await _dict_kb(state, create_creditor_keyboard, OperationState.choosing_outcome_creditor)
         message_id = data.get("outcome_source_message_id")
-    elif prev_state == OperationState.choosing_outcome_chapter.state:
-        text, kb = MSG_CHOOSE_CHAPTER, _kb_chapter()
+    elif prev_state == S_OUT_CHAPTER:
+        text, kb = MSG_CHOOSE_CHAPTER, KB_CHAPTER
         message_id = data.get("chapter_message_id")
-    elif prev_state == OperationState.choosing_outcome_project.state:
+    elif prev_state == S_OUT_PROJECT:
         text, kb = await get_choose_outcome_project_message(state)
         message_id = data.get("project_message_id")
-    elif prev_state == OperationState.choosing_outcome_general_type.state:
+    elif prev_state == S_OUT_GENERAL_TYPE:
         text, kb = await get_choose_outcome_general_type_message()
         message_id = data.get("general_type_message_id")
-    elif prev_state == OperationState.choosing_outcome_article.state:
+    elif prev_state == S_OUT_ARTICLE:
         text, kb = await _msg_choose_article(state)
         message_id = data.get("article_message_id")
-    elif prev_state in {OperationState.choosing_contractor.state, OperationState.choosing_material.state,
-                        OperationState.choosing_employee.state, OperationState.choosing_creditor.state,
-                        OperationState.choosing_founder.state}:
+    elif prev_state in S_ARTICLE_DETAILS:
         text, kb = await _msg_choose_article(state)
         message_id = data.get("article_message_id")
     else:
@@ -162,35 +185,32 @@ async def process_back_navigation(cb: CallbackQuery, state: FSMContext, bot: Bot
 
     if message_id:
         try:
-            await bot.edit_message_text(chat_id=cb.message.chat.id, message_id=message_id, text=text, reply_markup=kb,
-                                        parse_mode="HTML")
+            await bot.edit_message_text(chat_id=cb.message.chat.id, message_id=message_id, text=text, reply_markup=kb)
         except TelegramBadRequest as e:
-            if "message is not modified" in str(e):
+            reason = e.message  # описание от Bot API; кодов ошибок‑строк Telegram не отдаёт
+            if "message is not modified" in reason:
                 await cb.answer("Клавиатура уже отображена.")
-            elif "message to edit not found" in str(e):
-                new_message = await bot.send_message(chat_id=cb.message.chat.id, text=text, reply_markup=kb,
-                                                     parse_mode="HTML")
-                if prev_state == OperationState.choosing_operation_date.state:
+            elif "message to edit not found" in reason:
+                new_message = await bot.send_message(chat_id=cb.message.chat.id, text=text, reply_markup=kb)
+                if prev_state == S_OP_DATE:
                     await state.update_data(date_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_operation_type.state:
+                elif prev_state == S_OP_TYPE:
                     await state.update_data(type_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_income_wallet.state:
+                elif prev_state == S_INCOME_WALLET:
                     await state.update_data(income_wallet_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_income_article.state:
+                elif prev_state == S_INCOME_ARTICLE:
                     await state.update_data(article_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_outcome_wallet_or_creditor.state:
+                elif prev_state == S_OUT_SOURCE:
                     await state.update_data(outcome_source_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_outcome_chapter.state:
+                elif prev_state == S_OUT_CHAPTER:
                     await state.update_data(chapter_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_outcome_project.state:
+                elif prev_state == S_OUT_PROJECT:
                     await state.update_data(project_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_outcome_general_type.state:
+                elif prev_state == S_OUT_GENERAL_TYPE:
                     await state.update_data(general_type_message_id=new_message.message_id)
-                elif prev_state == OperationState.choosing_outcome_article.state:
+                elif prev_state == S_OUT_ARTICLE:
                     await state.update_data(article_message_id=new_message.message_id)
-                elif prev_state in {OperationState.choosing_contractor.state, OperationState.choosing_material.state,
-                                    OperationState.choosing_employee.state, OperationState.choosing_creditor.state,
-                                    OperationState.choosing_founder.state}:
+                elif prev_state in S_ARTICLE_DETAILS:
                     await state.update_data(article_message_id=new_message.message_id)
             else:
                 raise
@@ -198,7 +218,7 @@ async def process_back_navigation(cb: CallbackQuery, state: FSMContext, bot: Bot
         try:
             await cb.message.edit_text(text, reply_markup=kb)
         except TelegramBadRequest as e:
-            if "message is not modified" in str(e):
+            if "message is not modified" in e.message:
                 await cb.answer("Клавиатура уже отображена.")
             else:
                 raise
@@ -4,33 +4,32 @@
 
 from __future__ import annotations
 
-from typing import Final, Callable, Tuple
+import asyncio
+from typing import Final, Callable, NamedTuple, Tuple
 
 from aiogram import Bot, Router
 from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.bot.keyboards.article_kb import ArticleCallback
 from src.bot.keyboards.contractor_kb import ContractorCallback, create_contractor_keyboard
 from src.bot.keyboards.creditor_kb import CreditorCallback, create_creditor_keyboard
 from src.bot.keyboards.employee_kb import EmployeeCallback, create_employee_keyboard
 from src.bot.keyboards.founder_kb import FounderCallback, create_founder_keyboard
 from src.bot.keyboards.material_kb import MaterialCallback, create_material_keyboard
+from src.bot.middlewares.db_session import DbSessionMiddleware
 from src.bot.state import OperationState
 from src.bot.utils.legacy_messages import track_messages
+from src.bot.utils.ref_cache import get_ref_cache
 from src.core.logger import configure_logger
 from src.db import (
-    get_async_session,
-    get_article,
-    get_contractor,
-    get_creditor,
-    get_employee,
-    get_founder,
-    get_material,
-    get_project,
-    get_wallet,
+    get_creditor_cached,
 )
 
 router: Final = Router()
+router.callback_query.middleware(DbSessionMiddleware())  # одна сессия на callback → `session`
 log = configure_logger(prefix="OUT_ART", color="magenta", level="INFO")
 
 # ────────────────────────────── ТЕКСТЫ ────────────────────────────────
@@ -55,193 +54,303 @@ MSG_ENTER_AMOUNT      = f"{EMO_AMOUNT} Введите сумму операци
 PROJECT_LABEL = "По проектам"
 GENERAL_LABEL = "Общие"
 
+# Строки сводки выбытия (порядок деталей фиксирован)
+SUMMARY_WALLET:   Final = f"{EMO_WALLET} Кошелёк: <b>{{}}</b>"
+SUMMARY_CREDITOR: Final = f"{EMO_CREDITOR} Кредитор: <b>{{}}</b>"
+SUMMARY_PROJECT:  Final = (
+    f"{EMO_PROJECT} Категория: <b>{PROJECT_LABEL}</b>\n"
+    f"  {EMO_PROJECT} Проект: <b>{{}}</b>"
+)
+SUMMARY_GENERAL:  Final = f"{EMO_GENERAL} Категория: <b>{GENERAL_LABEL}</b>"
+SUMMARY_ARTICLE:  Final = f"{EMO_ARTICLE} Статья: <b>{{}}</b>"
+SUMMARY_DETAILS:  Final = (
+    ("contractor",       f"{EMO_CONTRACT} Подрядчик: <b>{{}}</b>"),
+    ("material",         f"{EMO_MATERIAL} Материал: <b>{{}}</b>"),
+    ("employee",         f"{EMO_EMPLOYEE} Сотрудник: <b>{{}}</b>"),
+    ("article_creditor", f"{EMO_CREDITOR} Кредитор: <b>{{}}</b>"),
+    ("founder",          f"{EMO_FOUNDER} Учредитель: <b>{{}}</b>"),
+)
+
 # ─────────────────────────── ПОМОЩНИКИ UI ──────────────────────────────
 async def _show_dict_kb(
     cb: CallbackQuery,
     state: FSMContext,
+    session: AsyncSession,
     builder: Callable,
     next_state: OperationState,
     prompt: str,
 ) -> None:
     """Показ справочника (подрядчики, материалы …)."""
-    async with get_async_session() as session:
-        kb = await builder(session, state=state)
+    kb = await builder(session, state=state)
+    # данные собраны — возвращаем соединение в пул до запросов к Bot API
+    await session.commit()
     await state.set_state(next_state)
     await cb.message.edit_text(prompt, reply_markup=kb)
     await cb.answer()
 
-async def _build_outcome_summary(state: FSMContext) -> str:
-    """Красочная сводка сделанных выборов."""
-    data = await state.get_data()
-    lines: list[str] = []
-
-    async with get_async_session() as session:
-        if wid := data.get("outcome_wallet"):
-            wallet = await get_wallet(session, wid)
-            lines.append(f"{EMO_WALLET} Кошелёк: <b>{wallet.wallet_number}</b>")
-        elif cid := data.get("outcome_creditor"):
-            cred = await get_creditor(session, cid)
-            lines.append(f"{EMO_CREDITOR} Кредитор: <b>{cred.name}</b>")
-
-        if proj_id := data.get("outcome_chapter"):
-            proj = await get_project(session, proj_id)
-            lines.append(f"{EMO_PROJECT} Категория: <b>{PROJECT_LABEL}</b>")
-            lines.append(f"  {EMO_PROJECT} Проект: <b>{proj.name}</b>")
-        elif gt := data.get("outcome_general_type"):
-            lines.append(f"{EMO_GENERAL} Категория: <b>{GENERAL_LABEL}</b>")
-
-        if art_id := data.get("outcome_article"):
-            art = await get_article(session, art_id)
-            art_name = art.name if art else str(art_id)
-            lines.append(f"{EMO_ARTICLE} Статья: <b>{art_name}</b>")
-
-        # детализаторы статьи
-        if con_id := data.get("contractor_id"):
-            contr = await get_contractor(session, con_id)
-            lines.append(f"{EMO_CONTRACT} Подрядчик: <b>{contr.name}</b>")
-        if mat_id := data.get("material_id"):
-            mat = await get_material(session, mat_id)
-            lines.append(f"{EMO_MATERIAL} Материал: <b>{mat.name}</b>")
-        if emp_id := data.get("employee_id"):
-            emp = await get_employee(session, emp_id)
-            lines.append(f"{EMO_EMPLOYEE} Сотрудник: <b>{emp.name}</b>")
-        if art_cred := data.get("outcome_article_creditor"):
-            lines.append(f"{EMO_CREDITOR} Кредитор: <b>{art_cred}</b>")
-        if founder_id := data.get("outcome_founder_id"):
-            founder = await get_founder(session, founder_id)
-            lines.append(f"{EMO_FOUNDER} Учредитель: <b>{founder.name}</b>")
-
-    return "\n".join(lines)
+async def _build_outcome_summary(
+    state: FSMContext,
+    data: dict,
+    session: AsyncSession | None = None,
+) -> str:
+    """Красочная сводка сделанных выборов.
+
+    `data` — актуальные FSM‑данные (результат `state.update_data`), чтобы не
+    перечитывать хранилище. Все подписи берутся одним запросом `fetch_refs`
+    через кэш пользователя; если вызывающий уже держит `session`, используем
+    её, иначе соединение из пула берётся только при промахе кэша.
+    """
+    refs = await get_ref_cache(state).get(
+        session,
+        wallet_id=data.get("outcome_wallet"),
+        creditor_id=None if data.get("outcome_wallet") else data.get("outcome_creditor"),
+        project_id=data.get("outcome_chapter"),
+        article_id=data.get("outcome_article"),
+        contractor_id=data.get("contractor_id"),
+        material_id=data.get("material_id"),
+        employee_id=data.get("employee_id"),
+        founder_id=data.get("outcome_founder_id"),
+    )
+    if art_cred := data.get("outcome_article_creditor"):
+        refs["article_creditor"] = art_cred
+
+    # дальше — только форматирование, без ввода‑вывода
+    if "wallet" in refs:
+        source = SUMMARY_WALLET.format(refs["wallet"])
+    elif "creditor" in refs:
+        source = SUMMARY_CREDITOR.format(refs["creditor"])
+    else:
+        source = None
+
+    if "project" in refs:
+        category = SUMMARY_PROJECT.format(refs["project"])
+    elif data.get("outcome_general_type"):
+        category = SUMMARY_GENERAL
+    else:
+        category = None
+
+    article = (
+        SUMMARY_ARTICLE.format(refs["article"] or data["outcome_article"])
+        if "article" in refs else None
+    )
+
+    parts = (
+        source,
+        category,
+        article,
+        *(tpl.format(refs[kind]) for kind, tpl in SUMMARY_DETAILS if kind in refs),
+    )
+    return "\n".join(part for part in parts if part)
 
 async def _proceed_to_amount(
     cb: CallbackQuery,
     state: FSMContext,
-    summary_text: str | None = None,
+    session: AsyncSession,
+    summary_text: str,
 ) -> None:
-    """Переход к вводу суммы: выводим сводку и спрашиваем сумму."""
+    """
+    Переход к вводу суммы: сводка и запрос суммы — одним отредактированным
+    сообщением (один вызов Bot API вместо edit + send).
+
+    Сводку всегда передаёт вызывающий (он уже отрендерил её в `session`);
+    пустая строка — показать только запрос суммы. Транзакция `session`
+    завершается здесь же, до обращений к Telegram.
+    """
+    await session.commit()
     await state.set_state(OperationState.entering_operation_amount)
 
-    if summary_text is None:
-        summary_text = await _build_outcome_summary(state)
-
+    # ответ на callback не зависит от вывода сообщения — шлём параллельно
     if summary_text:
-        msg = await cb.message.edit_text(summary_text, parse_mode="HTML")
-        await state.update_data(summary_message_id=msg.message_id)
-
-    amt_msg = await cb.message.bot.send_message(cb.message.chat.id, MSG_ENTER_AMOUNT)
-    await state.update_data(amount_message_id=amt_msg.message_id)
-    await cb.answer()
+        msg, _ = await asyncio.gather(
+            cb.message.edit_text(f"{summary_text}\n\n{MSG_ENTER_AMOUNT}"),
+            cb.answer(),
+        )
+        # summary_text нужен handle_amount, чтобы не затереть сводку при подтверждении
+        await state.update_data(
+            summary_message_id=msg.message_id,
+            amount_message_id=msg.message_id,
+            amount_prompt_id=msg.message_id,
+            summary_text=summary_text,
+        )
+    else:
+        amt_msg, _ = await asyncio.gather(
+            cb.message.bot.send_message(cb.message.chat.id, MSG_ENTER_AMOUNT),
+            cb.answer(),
+        )
+        await state.update_data(
+            amount_message_id=amt_msg.message_id,
+            amount_prompt_id=amt_msg.message_id,
+        )
+
+# ──────────────────── СТАТЬИ С УТОЧНЕНИЕМ ───────────────────────────
+class ArticleFlow(NamedTuple):
+    """Уточняющий шаг статьи."""
+    builder: Callable     # клавиатура справочника
+    next_state: State     # следующий шаг
+    prompt: str           # подсказка под сводкой
+    reset_key: str        # ключ FSM, сбрасываемый при (пере)выборе статьи
+
+
+_EMPLOYEE_STEP = ArticleFlow(create_employee_keyboard, OperationState.choosing_employee, MSG_CHOOSE_EMPLOYEE, "employee_id")
+
+# article_id → уточняющий шаг; статьи без записи сразу переходят к сумме
+ARTICLE_DISPATCH: Final[dict[int, ArticleFlow]] = {
+    3:  ArticleFlow(create_contractor_keyboard, OperationState.choosing_contractor, MSG_CHOOSE_CONTRACTOR, "contractor_id"),
+    4:  ArticleFlow(create_material_keyboard, OperationState.choosing_material, MSG_CHOOSE_MATERIAL, "material_id"),
+    7:  _EMPLOYEE_STEP,
+    8:  _EMPLOYEE_STEP,
+    11: _EMPLOYEE_STEP,
+    29: ArticleFlow(create_creditor_keyboard, OperationState.choosing_creditor, MSG_CHOOSE_CREDITOR, "outcome_article_creditor"),
+    30: ArticleFlow(create_founder_keyboard, OperationState.choosing_founder, MSG_CHOOSE_FOUNDER, "outcome_founder_id"),
+}
 
 # ─────────────────────── ВЫБОР СТАТЬИ ────────────────────────────────
-@router.callback_query(ArticleCallback.filter(), OperationState.choosing_outcome_article)
+@router.callback_query(OperationState.choosing_outcome_article, ArticleCallback.filter())
 @track_messages
 async def choose_outcome_article(
     cb: CallbackQuery,
     state: FSMContext,
     bot: Bot,  # noqa: ARG001
+    callback_data: ArticleCallback,
+    session: AsyncSession,
 ) -> None:
-    article_id = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        art = await get_article(session, article_id)
+    article_id = callback_data.article_id
+    # одна запись: сама статья + сброс её уточнителя (если он есть)
+    flow = ARTICLE_DISPATCH.get(article_id)
+    updates = {"outcome_article": article_id}
+    if flow is not None:
+        updates[flow.reset_key] = None
+
+    # название статьи приходит тем же запросом, что и вся сводка
+    data = await state.update_data(updates)
+    summary = await _build_outcome_summary(state, data, session)
 
-    await state.update_data(outcome_article=article_id)
     log.info(
-        f"Юзер {cb.from_user.full_name} ({cb.from_user.id}): выбрана статья – "
-        f"{art.name if art else article_id} (ID {article_id})"
+        "Юзер {} ({}): выбрана статья – "
+        "{} (ID {})",
+        cb.from_user.full_name,
+        cb.from_user.id,
+        get_ref_cache(state).label("article", article_id) or article_id,
+        article_id,
     )
 
-    summary = await _build_outcome_summary(state)
-
-    match article_id:
-        case 3:
-            await _show_dict_kb(cb, state, create_contractor_keyboard,
-                                OperationState.choosing_contractor,
-                                f"{summary}\n\n{MSG_CHOOSE_CONTRACTOR}")
-            await state.update_data(contractor_id=None)
-        case 4:
-            await _show_dict_kb(cb, state, create_material_keyboard,
-                                OperationState.choosing_material,
-                                f"{summary}\n\n{MSG_CHOOSE_MATERIAL}")
-            await state.update_data(material_id=None)
-        case 7 | 8 | 11:
-            await _show_dict_kb(cb, state, create_employee_keyboard,
-                                OperationState.choosing_employee,
-                                f"{summary}\n\n{MSG_CHOOSE_EMPLOYEE}")
-            await state.update_data(employee_id=None)
-        case 29:
-            await _show_dict_kb(cb, state, create_creditor_keyboard,
-                                OperationState.choosing_creditor,
-                                f"{summary}\n\n{MSG_CHOOSE_CREDITOR}")
-            await state.update_data(outcome_article_creditor=None)
-        case 30:
-            await _show_dict_kb(cb, state, create_founder_keyboard,
-                                OperationState.choosing_founder,
-                                f"{summary}\n\n{MSG_CHOOSE_FOUNDER}")
-            await state.update_data(outcome_founder_id=None)
-        case _:
-            await _proceed_to_amount(cb, state, summary)
+    if flow is None:
+        await _proceed_to_amount(cb, state, session, summary)
+        return
+
+    await _show_dict_kb(cb, state, session, flow.builder, flow.next_state, f"{summary}\n\n{flow.prompt}")
 
 # ─────────────────────── ВЫБОР ПОДРЯДЧИКА ───────────────────────────
-@router.callback_query(ContractorCallback.filter(), OperationState.choosing_contractor)
+@router.callback_query(OperationState.choosing_contractor, ContractorCallback.filter())
 @track_messages
-async def choose_contractor(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    cid = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        contr = await get_contractor(session, cid)
+async def choose_contractor(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: ContractorCallback,
+    session: AsyncSession,
+) -> None:
+    cid = callback_data.contractor_id
+    data = await state.update_data(contractor_id=cid)
+    summary = await _build_outcome_summary(state, data, session)
 
-    await state.update_data(contractor_id=cid)
-    log.info(f"Юзер {cb.from_user.full_name} ({cb.from_user.id}): выбран подрядчик – {contr.name} (ID {cid})")
+    log.info(
+        "Юзер {} ({}): выбран подрядчик – {} (ID {})",
+        cb.from_user.full_name,
+        cb.from_user.id,
+        get_ref_cache(state).label("contractor", cid),
+        cid,
+    )
 
-    await _proceed_to_amount(cb, state)
+    await _proceed_to_amount(cb, state, session, summary)
 
 # ─────────────────────── ВЫБОР МАТЕРИАЛА ────────────────────────────
-@router.callback_query(MaterialCallback.filter(), OperationState.choosing_material)
+@router.callback_query(OperationState.choosing_material, MaterialCallback.filter())
 @track_messages
-async def choose_material(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    mid = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        mat = await get_material(session, mid)
+async def choose_material(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: MaterialCallback,
+    session: AsyncSession,
+) -> None:
+    mid = callback_data.material_id
+    data = await state.update_data(material_id=mid)
+    summary = await _build_outcome_summary(state, data, session)
 
-    await state.update_data(material_id=mid)
-    log.info(f"Юзер {cb.from_user.full_name} ({cb.from_user.id}): выбран материал – {mat.name} (ID {mid})")
+    log.info(
+        "Юзер {} ({}): выбран материал – {} (ID {})",
+        cb.from_user.full_name,
+        cb.from_user.id,
+        get_ref_cache(state).label("material", mid),
+        mid,
+    )
 
-    await _proceed_to_amount(cb, state)
+    await _proceed_to_amount(cb, state, session, summary)
 
 # ─────────────────────── ВЫБОР СОТРУДНИКА ────────────────────────────
-@router.callback_query(EmployeeCallback.filter(), OperationState.choosing_employee)
+@router.callback_query(OperationState.choosing_employee, EmployeeCallback.filter())
 @track_messages
-async def choose_employee(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    eid = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        emp = await get_employee(session, eid)
+async def choose_employee(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: EmployeeCallback,
+    session: AsyncSession,
+) -> None:
+    eid = callback_data.employee_id
+    data = await state.update_data(employee_id=eid)
+    summary = await _build_outcome_summary(state, data, session)
 
-    await state.update_data(employee_id=eid)
-    log.info(f"Юзер {cb.from_user.full_name} ({cb.from_user.id}): выбран сотрудник – {emp.name} (ID {eid})")
+    log.info(
+        "Юзер {} ({}): выбран сотрудник – {} (ID {})",
+        cb.from_user.full_name,
+        cb.from_user.id,
+        get_ref_cache(state).label("employee", eid),
+        eid,
+    )
 
-    await _proceed_to_amount(cb, state)
+    await _proceed_to_amount(cb, state, session, summary)
 
 # ─────────────────────── ВЫБОР КРЕДИТОРА ────────────────────────────
-@router.callback_query(CreditorCallback.filter(), OperationState.choosing_creditor)
+@router.callback_query(OperationState.choosing_creditor, CreditorCallback.filter())
 @track_messages
-async def choose_creditor(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    cid = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        cred = await get_creditor(session, cid)
+async def choose_creditor(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: CreditorCallback,
+    session: AsyncSession,
+) -> None:
+    cid = callback_data.creditor_id
+    cred = await get_creditor_cached(session, cid)
+    data = await state.update_data(outcome_article_creditor=cred.name)
+    summary = await _build_outcome_summary(state, data, session)
 
-    await state.update_data(outcome_article_creditor=cred.name)
-    log.info(f"Юзер {cb.from_user.full_name} ({cb.from_user.id}): выбран кредитор – {cred.name} (ID {cid})")
+    log.info("Юзер {} ({}): выбран кредитор – {} (ID {})", cb.from_user.full_name, cb.from_user.id, cred.name, cid)
 
-    await _proceed_to_amount(cb, state)
+    await _proceed_to_amount(cb, state, session, summary)
 
 # ─────────────────────── ВЫБОР УЧРЕДИТЕЛЯ ────────────────────────────
-@router.callback_query(FounderCallback.filter(), OperationState.choosing_founder)
+@router.callback_query(OperationState.choosing_founder, FounderCallback.filter())
 @track_messages
-async def choose_founder(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    fid = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        founder = await get_founder(session, fid)
+async def choose_founder(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: FounderCallback,
+    session: AsyncSession,
+) -> None:
+    fid = callback_data.founder_id
+    data = await state.update_data(outcome_founder_id=fid)
+    summary = await _build_outcome_summary(state, data, session)
 
-    await state.update_data(outcome_founder_id=fid)
-    log.info(f"Юзер {cb.from_user.full_name} ({cb.from_user.id}): выбран учредитель – {founder.name} (ID {fid})")
+    log.info(
+        "Юзер {} ({}): выбран учредитель – {} (ID {})",
+        cb.from_user.full_name,
+        cb.from_user.id,
+        get_ref_cache(state).label("founder", fid),
+        fid,
+    )
 
-    await _proceed_to_amount(cb, state)
+    await _proceed_to_amount(cb, state, session, summary)
@@ -4,9 +4,10 @@
 
 from __future__ import annotations
 
-from typing import Final, Callable, Tuple
+from typing import Final, Callable, Literal, Tuple
 
 from aiogram import Bot, F, Router
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -15,10 +16,10 @@ from src.bot.keyboards.article_kb import create_article_keyboard
 from src.bot.keyboards.creditor_kb import CreditorCallback, create_creditor_keyboard
 from src.bot.keyboards.project_kb import create_project_keyboard, ProjectCallback
 from src.bot.keyboards.wallet_kb import WalletCallback, create_wallet_keyboard
-from src.bot.state import OperationState
+from src.bot.state import OperationState, push_state_step
 from src.bot.utils.legacy_messages import track_messages
 from src.core.logger import configure_logger
-from src.db import get_async_session, get_wallet, get_creditor, get_project
+from src.db import get_async_session, get_wallet_cached, get_creditor_cached, get_project_cached
 
 # ───────────────────────────── КОНСТАНТЫ UI ─────────────────────────────
 EMOJI_WALLET:   Final = "🏦"
@@ -32,6 +33,14 @@ MSG_CHOOSE_GENERAL   : Final = "Выберите тип общих операц
 MSG_CHOOSE_ARTICLE   : Final = f"{EMOJI_FOLDER} Выберите статью выбытия:"
 MSG_SELECT_DICT      : Final = "Выберите кошелёк для выбытия или кредитора:"
 
+MSG_WALLET_CHOSEN    : Final = "✅ Выбран кошелёк: <b>{label}</b>\n"
+MSG_CREDITOR_CHOSEN  : Final = "✅ Выбран кредитор: <b>{label}</b>\n"
+MSG_CHAPTER_CHOSEN   : Final = "✅ Выбрана категория: <b>{label}</b>\n"
+
+# «источник выбран» + запрос категории — собраны заранее, на клике только format
+TPL_WALLET_THEN_CHAPTER   : Final = MSG_WALLET_CHOSEN + MSG_CHOOSE_CHAPTER
+TPL_CREDITOR_THEN_CHAPTER : Final = MSG_CREDITOR_CHOSEN + MSG_CHOOSE_CHAPTER
+
 PROJECT_LABEL  = "📋 По проектам"
 GENERAL_LABEL  = "🌐 Общие"
 FINANCE_LABEL  = "💰 Фин. операции и инвестиции"
@@ -42,12 +51,32 @@ BACK_LABEL     = "⬅️ Назад"
 router: Final = Router()
 log = configure_logger(prefix="OUTCOME", color="red", level="INFO")
 
+# ─────────────────────────── CallbackData ───────────────────────────────
+# Префиксы совпадают с прежними строками «out_src:…» и т.п. — старые
+# клавиатуры в чатах продолжают работать.
+class SourceCallback(CallbackData, prefix="out_src"):
+    kind: Literal["wallet", "creditor"]
+
+
+class ChapterCallback(CallbackData, prefix="outcome_chapter"):
+    value: Literal["project", "general"]
+
+
+class GeneralTypeCallback(CallbackData, prefix="general_type"):
+    value: Literal["finance", "payroll"]
+
 # ──────────────────────────── КЛАВИАТУРЫ ───────────────────────────────
 def _kb_source() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.row(
-        InlineKeyboardButton(text=f"{EMOJI_WALLET} Кошелёк",   callback_data="out_src:wallet"),
-        InlineKeyboardButton(text=f"{EMOJI_CREDITOR} Кредитор", callback_data="out_src:creditor"),
+        InlineKeyboardButton(
+            text=f"{EMOJI_WALLET} Кошелёк",
+            callback_data=SourceCallback(kind="wallet").pack(),
+        ),
+        InlineKeyboardButton(
+            text=f"{EMOJI_CREDITOR} Кредитор",
+            callback_data=SourceCallback(kind="creditor").pack(),
+        ),
     )
     return kb.as_markup()
 
@@ -55,19 +84,25 @@ def _kb_source() -> InlineKeyboardMarkup:
 def _kb_chapter() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.row(
-        InlineKeyboardButton(text=PROJECT_LABEL, callback_data="outcome_chapter:project"),
-        InlineKeyboardButton(text=GENERAL_LABEL, callback_data="outcome_chapter:general"),
+        InlineKeyboardButton(text=PROJECT_LABEL, callback_data=ChapterCallback(value="project").pack()),
+        InlineKeyboardButton(text=GENERAL_LABEL, callback_data=ChapterCallback(value="general").pack()),
     )
     return kb.as_markup()
 
 
 def _kb_general_types() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
-    kb.row(InlineKeyboardButton(text=FINANCE_LABEL, callback_data="general_type:finance"))
-    kb.row(InlineKeyboardButton(text=PAYROLL_LABEL, callback_data="general_type:payroll"))
+    kb.row(InlineKeyboardButton(text=FINANCE_LABEL, callback_data=GeneralTypeCallback(value="finance").pack()))
+    kb.row(InlineKeyboardButton(text=PAYROLL_LABEL, callback_data=GeneralTypeCallback(value="payroll").pack()))
     kb.row(InlineKeyboardButton(text=BACK_LABEL,    callback_data="nav:back"))
     return kb.as_markup()
 
+
+# Клавиатуры статичны — собираем один раз при импорте
+KB_SOURCE:        Final = _kb_source()
+KB_CHAPTER:       Final = _kb_chapter()
+KB_GENERAL_TYPES: Final = _kb_general_types()
+
 # ────────────────────────── HELPERS (TEXT+KB) ───────────────────────────
 async def _dict_kb(
     state: FSMContext,
@@ -88,7 +123,7 @@ async def _msg_choose_project(state: FSMContext) -> Tuple[str, InlineKeyboardMar
 
 
 async def _msg_choose_general_type() -> Tuple[str, InlineKeyboardMarkup]:
-    return MSG_CHOOSE_GENERAL, _kb_general_types()
+    return MSG_CHOOSE_GENERAL, KB_GENERAL_TYPES
 
 
 async def _msg_choose_article(state: FSMContext) -> Tuple[str, InlineKeyboardMarkup]:
@@ -97,7 +132,9 @@ async def _msg_choose_article(state: FSMContext) -> Tuple[str, InlineKeyboardMar
     return MSG_CHOOSE_ARTICLE, kb_builder
 
 # ─────────────────── WALLET / CREDITOR ИСТОЧНИК ─────────────────────────
-@router.callback_query(F.data == "out_src:wallet", OperationState.choosing_outcome_wallet_or_creditor)
+@router.callback_query(
+    OperationState.choosing_outcome_wallet_or_creditor, SourceCallback.filter(F.kind == "wallet")
+)
 @track_messages
 async def outcome_src_wallet(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
     text, kb = await _dict_kb(state, create_wallet_keyboard, OperationState.choosing_outcome_wallet)
@@ -105,7 +142,9 @@ async def outcome_src_wallet(cb: CallbackQuery, state: FSMContext, bot: Bot) ->
     await cb.answer()
 
 
-@router.callback_query(F.data == "out_src:creditor", OperationState.choosing_outcome_wallet_or_creditor)
+@router.callback_query(
+    OperationState.choosing_outcome_wallet_or_creditor, SourceCallback.filter(F.kind == "creditor")
+)
 @track_messages
 async def outcome_src_creditor(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
     text, kb = await _dict_kb(state, create_creditor_keyboard, OperationState.choosing_outcome_creditor)
@@ -113,99 +152,109 @@ async def outcome_src_creditor(cb: CallbackQuery, state: FSMContext, bot: Bot) -
     await cb.answer()
 
 # ────────────────────────── ВЫБОР КОШЕЛЬКА ──────────────────────────────
-@router.callback_query(WalletCallback.filter(), OperationState.choosing_outcome_wallet)
+@router.callback_query(OperationState.choosing_outcome_wallet, WalletCallback.filter())
 @track_messages
-async def choose_outcome_wallet(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    wallet_id = cb.data.split(":")[1]
+async def choose_outcome_wallet(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: WalletCallback,
+) -> None:
+    wallet_id = callback_data.wallet_id
     async with get_async_session() as session:
-        wallet = await get_wallet(session, wallet_id)
+        wallet = await get_wallet_cached(session, wallet_id)
 
     await state.update_data(
         outcome_wallet=wallet_id,
+        outcome_wallet_label=wallet.wallet_number,
         state_history=[OperationState.choosing_outcome_wallet_or_creditor.state],
     )
-    log.info(f"Юзер {cb.from_user.full_name}: выбран wallet – {wallet.wallet_number}")
+    log.info("Юзер {}: выбран wallet – {}", cb.from_user.full_name, wallet.wallet_number)
 
-    text, kb = MSG_CHOOSE_CHAPTER, _kb_chapter()
     await cb.message.edit_text(
-        f"✅ Выбран кошелёк: <b>{wallet.wallet_number}</b>\n{text}",
-        reply_markup=kb,
+        TPL_WALLET_THEN_CHAPTER.format(label=wallet.wallet_number),
+        reply_markup=KB_CHAPTER,
     )
     await state.set_state(OperationState.choosing_outcome_chapter)
     await cb.answer()
 
 # ────────────────────────── ВЫБОР КРЕДИТОРА ─────────────────────────────
-@router.callback_query(CreditorCallback.filter(), OperationState.choosing_outcome_creditor)
+@router.callback_query(OperationState.choosing_outcome_creditor, CreditorCallback.filter())
 @track_messages
-async def choose_outcome_creditor(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    creditor_id = int(cb.data.split(":")[1])
+async def choose_outcome_creditor(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: CreditorCallback,
+) -> None:
+    creditor_id = callback_data.creditor_id
     async with get_async_session() as session:
-        creditor = await get_creditor(session, creditor_id)
+        creditor = await get_creditor_cached(session, creditor_id)
 
     await state.update_data(
         outcome_creditor=creditor_id,
+        outcome_creditor_label=creditor.name,
         state_history=[OperationState.choosing_outcome_wallet_or_creditor.state],
     )
-    log.info(f"Юзер {cb.from_user.full_name}: выбран creditor – {creditor.name}")
+    log.info("Юзер {}: выбран creditor – {}", cb.from_user.full_name, creditor.name)
 
-    text, kb = MSG_CHOOSE_CHAPTER, _kb_chapter()
     await cb.message.edit_text(
-        f"✅ Выбран кредитор: <b>{creditor.name}</b>\n{text}",
-        reply_markup=kb,
+        TPL_CREDITOR_THEN_CHAPTER.format(label=creditor.name),
+        reply_markup=KB_CHAPTER,
     )
     await state.set_state(OperationState.choosing_outcome_chapter)
     await cb.answer()
 
 # ──────────────────────── ВЫБОР КАТЕГОРИИ ───────────────────────────────
-@router.callback_query(OperationState.choosing_outcome_chapter)
+@router.callback_query(OperationState.choosing_outcome_chapter, ChapterCallback.filter())
 @track_messages
-async def choose_outcome_chapter(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    chapter = cb.data.split(":")[1]
-    hist = (await state.get_data()).get("state_history", [])
-    hist.append(OperationState.choosing_outcome_chapter.state)
-    await state.update_data(state_history=hist)
+async def choose_outcome_chapter(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: ChapterCallback,
+) -> None:
+    chapter = callback_data.value
+    data = await push_state_step(state, OperationState.choosing_outcome_chapter.state)
 
     if chapter == "project":
         label = PROJECT_LABEL
         text, kb = await _msg_choose_project(state)
         next_state = OperationState.choosing_outcome_project
-    elif chapter == "general":
+    else:
         label = GENERAL_LABEL
         text, kb = await _msg_choose_general_type()
         next_state = OperationState.choosing_outcome_general_type
-    else:
-        raise ValueError(f"Unknown outcome_chapter: {chapter}")
 
-    # Добавляем выбранный источник в заголовок
-    data = await state.get_data()
+    # Добавляем выбранный источник в заголовок (подпись сохранена на шаге выбора)
     prefix = ""
     if data.get("outcome_wallet"):
-        async with get_async_session() as session:
-            wallet = await get_wallet(session, data["outcome_wallet"])
-        prefix = f"✅ Выбран кошелёк: <b>{wallet.wallet_number}</b>\n"
+        prefix = MSG_WALLET_CHOSEN.format(label=data.get("outcome_wallet_label"))
     elif data.get("outcome_creditor"):
-        async with get_async_session() as session:
-            creditor = await get_creditor(session, data["outcome_creditor"])
-        prefix = f"✅ Выбран кредитор: <b>{creditor.name}</b>\n"
+        prefix = MSG_CREDITOR_CHOSEN.format(label=data.get("outcome_creditor_label"))
 
-    await cb.message.edit_text(f"{prefix}✅ Выбрана категория: <b>{label}</b>\n{text}", reply_markup=kb)
+    await cb.message.edit_text(
+        "".join((prefix, MSG_CHAPTER_CHOSEN.format(label=label), text)),
+        reply_markup=kb,
+    )
     await state.set_state(next_state)
     await cb.answer()
 
 # ────────────────────────── ВЫБОР ПРОЕКТА ───────────────────────────────
-@router.callback_query(ProjectCallback.filter(), OperationState.choosing_outcome_project)
+@router.callback_query(OperationState.choosing_outcome_project, ProjectCallback.filter())
 @track_messages
-async def set_outcome_project(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    project_id = int(cb.data.split(":")[1])
-    async with get_async_session() as session:
-        project = await get_project(session, project_id)
-
-    hist = (await state.get_data()).get("state_history", [])
-    hist.append(OperationState.choosing_outcome_project.state)
-    await state.update_data(state_history=hist, outcome_chapter=project_id)
+async def set_outcome_project(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: ProjectCallback,
+) -> None:
+    project_id = callback_data.project_id
+    await push_state_step(state, OperationState.choosing_outcome_project.state, outcome_chapter=project_id)
 
-    log.info(f"Юзер {cb.from_user.full_name}: выбран project – {
-    project.name}")
+    async with get_async_session() as session:
+        project = await get_project_cached(session, project_id)
+    log.info("Юзер {}: выбран project – {}", cb.from_user.full_name, project.name if project else project_id)
 
     text, kb = await _msg_choose_article(state)
     await cb.message.edit_text(text, reply_markup=kb)
@@ -213,16 +262,21 @@ async def set_outcome_project(cb: CallbackQuery, state: FSMContext, bot: Bot) ->
     await cb.answer()
 
 # ─────────────────────── ВЫБОР ОБЩЕГО ТИПА ──────────────────────────────
-@router.callback_query(OperationState.choosing_outcome_general_type)
+@router.callback_query(OperationState.choosing_outcome_general_type, GeneralTypeCallback.filter())
 @track_messages
-async def choose_outcome_general_type(cb: CallbackQuery, state: FSMContext, bot: Bot) -> None:
-    g_type = cb.data.split(":")[1]
+async def choose_outcome_general_type(
+    cb: CallbackQuery,
+    state: FSMContext,
+    bot: Bot,
+    callback_data: GeneralTypeCallback,
+) -> None:
+    g_type = callback_data.value
 
-    hist = (await state.get_data()).get("state_history", [])
-    hist.append(OperationState.choosing_outcome_general_type.state)
-    await state.update_data(state_history=hist, outcome_general_type=g_type)
+    await push_state_step(
+        state, OperationState.choosing_outcome_general_type.state, outcome_general_type=g_type
+    )
 
-    log.info(f"Юзер {cb.from_user.full_name}: выбран general_type – {g_type}")
+    log.info("Юзер {}: выбран general_type – {}", cb.from_user.full_name, g_type)
 
     text, kb = await _msg_choose_article(state)
     await cb.message.edit_text(text, reply_markup=kb)
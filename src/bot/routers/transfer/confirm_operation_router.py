@@ -11,23 +11,25 @@
 
 from __future__ import annotations
 
-from typing import Final
+import asyncio
+from typing import Any, Dict, Final, Optional, Set
 
 from aiogram import Bot, F, Router
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters import BaseFilter, StateFilter
 from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
-from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
 
 from src.bot.state import OperationState, reset_state
-from src.bot.utils.legacy_messages import (
-    delete_key_messages,
-    delete_tracked_messages,
-    track_messages,
-)
+from src.bot.utils.legacy_messages import delete_operation_messages
 from src.core.logger import configure_logger
-from src.db import create_transfer, get_async_session, get_wallet
+from src.db import create_transfer, get_async_session, get_wallet_number
 
 # ─────────────────────────────── UI‑ТЕКСТЫ ────────────────────────────────
 EMOJI_CONFIRM:  Final = "✅"
@@ -38,6 +40,9 @@ EMOJI_REPEAT:   Final = "🔄"
 BTN_CONFIRM_TEXT: Final = f"{EMOJI_CONFIRM} Подтвердить"
 BTN_CANCEL_TEXT:  Final = f"{EMOJI_CANCEL} Отклонить"
 
+# Разделитель тысяч в сумме: «,» → пробел
+_AMT_SEP: Final = " "
+
 MSG_OPERATION_REQUEST: Final = (
     "Подтвердите операцию:\n{info}\n\n"
     "Нажмите кнопку для выбора:"
@@ -45,8 +50,9 @@ MSG_OPERATION_REQUEST: Final = (
 MSG_TRANSFER_SUCCESS: Final = (
     f"Перемещение успешно добавлено {EMOJI_CONFIRM}\n{{info}}"
 )
+MSG_TRANSFER_SAVING: Final = f"Сохраняем перемещение… ⏳\n{{info}}"
 MSG_TRANSFER_ERROR: Final = (
-    "Ошибка при добавлении перемещения:\n{info}\n\n{{error}} {EMOJI_ERROR}"
+    f"Ошибка при добавлении перемещения:\n{{info}}\n\n{{error}} {EMOJI_ERROR}"
 )
 MSG_TRANSFER_CANCEL: Final = (
     f"Добавление перемещения отменено:\n{{info}} {EMOJI_CANCEL}"
@@ -57,28 +63,31 @@ MSG_NEXT_OPERATION: Final = f"Выберите следующую операци
 router: Final = Router()
 log = configure_logger(prefix="CONFIRM", color="green", level="INFO")
 
+# Сильные ссылки на фоновые задачи записи, чтобы их не собрал GC
+_background_tasks: Set[asyncio.Task] = set()
+
 # ─────────────────────────── CallbackData ────────────────────────────────
 class TransferConfirmCallback(CallbackData, prefix="confirm-transfer"):
     """CallbackData для кнопок подтверждения/отмены."""
 
     action: str  # "yes" | "no"
 
+# Payload'ы кнопок постоянны — упаковываем один раз при импорте
+CB_YES: Final = TransferConfirmCallback(action="yes").pack()
+CB_NO:  Final = TransferConfirmCallback(action="no").pack()
+
 # ──────────────────────────── Клавиатура ─────────────────────────────────
-def create_confirm_keyboard() -> InlineKeyboardBuilder:
-    """Клавиатура подтверждения/отмены операции."""
-    kb = InlineKeyboardBuilder()
-    kb.button(
-        text=BTN_CONFIRM_TEXT,
-        callback_data=TransferConfirmCallback(action="yes").pack(),
-    )
-    kb.button(
-        text=BTN_CANCEL_TEXT,
-        callback_data=TransferConfirmCallback(action="no").pack(),
-    )
-    kb.adjust(2)
-    return kb
+CONFIRM_MARKUP: Final = InlineKeyboardMarkup(inline_keyboard=[[
+    InlineKeyboardButton(text=BTN_CONFIRM_TEXT, callback_data=CB_YES),
+    InlineKeyboardButton(text=BTN_CANCEL_TEXT,  callback_data=CB_NO),
+]])
 
 # ─────────────────────── Формирование сводки ─────────────────────────────
+async def _wallet_number(wallet_id: Optional[str], label: Optional[str] = None) -> str:
+    """Номер кошелька: из state, иначе из кэша/БД (своя сессия — для параллельных запросов)."""
+    return label or await get_wallet_number(wallet_id)
+
+
 async def format_operation_message(data: dict) -> str:
     """Делает «живую» сводку операции «Перемещение» для подтверждения."""
 
@@ -88,12 +97,14 @@ async def format_operation_message(data: dict) -> str:
     comment        = data.get("operation_comment", "—")
     op_date        = data.get("operation_date", "Не выбрано")
 
-    async with get_async_session() as session:
-        from_num = (await get_wallet(session, from_wallet_id)).wallet_number
-        to_num   = (await get_wallet(session, to_wallet_id)).wallet_number
+    # у каждого запроса своя сессия — оба SELECT идут параллельно
+    from_num, to_num = await asyncio.gather(
+        _wallet_number(from_wallet_id, data.get("from_wallet_label")),
+        _wallet_number(to_wallet_id, data.get("to_wallet_label")),
+    )
 
     # красивый вывод суммы «1 234,56»
-    amount_str = f"{amount:,.2f}".replace(",", " ")    # узкий неразрывный пробел
+    amount_str = f"{amount:,.2f}".replace(",", _AMT_SEP)
 
     return (
         f"🔄 <b>Перемещение</b> | Дата: <code>{op_date}</code>\n"
@@ -116,58 +127,93 @@ class TransferOperationFilter(BaseFilter):
     StateFilter(OperationState.entering_operation_comment),
     TransferOperationFilter(),
 )
-@track_messages
 async def handle_comment(msg: Message, state: FSMContext, bot: Bot) -> None:
     """Обрабатывает комментарий и запрашивает подтверждение операции."""
     comment = (msg.text or "").strip()
-    await state.update_data(operation_comment=comment)
-    log.info(f"Юзер {msg.from_user.full_name}: введён комментарий к операции - {comment}")
+    data = await state.update_data(operation_comment=comment)
+    log.info("Юзер {}: введён комментарий к операции - {}", msg.from_user.full_name, comment)
 
-    data = await state.get_data()
-    prompt_id = data.get("comment_message_id") - 1  # id сообщения‑промпта
+    prompt_id = data.get("comment_message_id")  # id сообщения‑промпта
 
     chat_id = msg.chat.id
 
-    info = await format_operation_message(await state.get_data())
+    info = await format_operation_message(data)
     confirm_text = MSG_OPERATION_REQUEST.format(info=info)
 
     sent = await bot.send_message(
         chat_id,
         confirm_text,
-        reply_markup=create_confirm_keyboard().as_markup(),
-        parse_mode="HTML",
+        reply_markup=CONFIRM_MARKUP,
     )
 
-    await msg.delete()
-    await bot.delete_message(chat_id, prompt_id)
-
-    log.warning(f" State data {await state.get_data()}")
+    log.debug("State data {}", data)
 
-    await delete_tracked_messages(bot, state, chat_id)
-    await delete_key_messages(bot, state, chat_id)
+    # удаления независимы друг от друга — одним пакетом
+    await asyncio.gather(
+        msg.delete(),
+        bot.delete_message(chat_id, prompt_id),
+        delete_operation_messages(bot, state, chat_id),
+        return_exceptions=True,
+    )
 
-    await state.update_data(confirm_message_id=sent.message_id - 1)
+    await state.update_data(confirm_message_id=sent.message_id)
     await state.set_state(OperationState.confirming_operation)
 
 # ──────────────────────── ПОДТВЕРЖДЕНИЕ (YES) ────────────────────────────
 @router.callback_query(
-    TransferConfirmCallback.filter(F.action == "yes"),
     OperationState.confirming_operation,
+    TransferConfirmCallback.filter(F.action == "yes"),
 )
-@track_messages
 async def confirm_yes(
     cb: CallbackQuery,
     state: FSMContext,
     bot: Bot,
     callback_data: TransferConfirmCallback,  # noqa: ARG001
 ) -> None:
-    """Юзер подтвердил операцию."""
+    """Юзер подтвердил операцию.
+
+    Запись в БД уходит в фоновую задачу: юзер сразу видит «Сохраняем…»,
+    а итоговое сообщение появляется по завершении `_persist_transfer`.
+    """
     data = await state.get_data()
     chat_id, message_id = cb.message.chat.id, cb.message.message_id
     info = await format_operation_message(data)
 
-    log.info(f"Юзер {cb.from_user.full_name}: подтвердил операцию")
+    log.info("Юзер {}: подтвердил операцию", cb.from_user.full_name)
+
+    # выходим из confirming_operation до записи — повторное «Да» не пройдёт
+    # фильтр состояния; данные мастера сохраняются до успешного коммита
+    await asyncio.gather(
+        delete_operation_messages(bot, state, chat_id, exclude_message_id=message_id),
+        bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=MSG_TRANSFER_SAVING.format(info=info),
+        ),
+    )
+    await asyncio.gather(state.set_state(None), cb.answer())
 
+    task = asyncio.create_task(
+        _persist_transfer(bot, state, chat_id, message_id, data, info)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _persist_transfer(
+    bot: Bot,
+    state: FSMContext,
+    chat_id: int,
+    message_id: int,
+    data: Dict[str, Any],
+    info: str,
+) -> None:
+    """Создаёт Transfer и заменяет «Сохраняем…» итоговым сообщением.
+
+    При ошибке записи возвращает `confirming_operation` и кнопки, чтобы
+    юзер мог повторить подтверждение. Состояние меняется, только если юзер
+    ещё не ушёл в другую операцию (см. `_owns_state`).
+    """
     try:
         async with get_async_session() as session:
             transfer_data = {
@@ -181,43 +227,81 @@ async def confirm_yes(
             transfer_obj = await create_transfer(session, transfer_data)
 
             log.info(
-                f"Создан Transfer {transfer_obj.transaction_id} – "
-                f"Дата: {transfer_obj.operation_date}, "
-                f"Кошельки: {transfer_obj.from_wallet} → {transfer_obj.to_wallet}, "
-                f"Сумма: {transfer_obj.operation_amount}, "
-                f"Комментарий: {transfer_obj.operation_comment}"
+                "Создан Transfer {} – "
+                "Дата: {}, "
+                "Кошельки: {} → {}, "
+                "Сумма: {}, "
+                "Комментарий: {}",
+                transfer_obj.transaction_id,
+                transfer_obj.operation_date,
+                transfer_obj.from_wallet,
+                transfer_obj.to_wallet,
+                transfer_obj.operation_amount,
+                transfer_obj.operation_comment,
             )
+    except Exception as error:  # noqa: BLE001
+        log.error("Ошибка при добавлении операции: {}", error)
+        owns_state = await _owns_state(state, message_id)
+        if owns_state:
+            await state.set_state(OperationState.confirming_operation)
+        await _edit_result(
+            bot,
+            chat_id,
+            message_id,
+            MSG_TRANSFER_ERROR.format(info=info, error=error),
+            reply_markup=CONFIRM_MARKUP if owns_state else None,
+        )
+        return
 
-        log.warning(f" State data {await state.get_data()}")
+    if await _owns_state(state, message_id):
+        await reset_state(state)
+    await _edit_result(bot, chat_id, message_id, MSG_TRANSFER_SUCCESS.format(info=info))
+    try:
+        await bot.send_message(chat_id, MSG_NEXT_OPERATION)
+    except TelegramAPIError as error:
+        log.warning("Не удалось отправить приглашение к следующей операции: {}", error)
 
-        await delete_tracked_messages(bot, state, chat_id)
-        await delete_key_messages(bot, state, chat_id)
 
+async def _owns_state(state: FSMContext, message_id: int) -> bool:
+    """FSM всё ещё за этим подтверждением, а не за новой операцией юзера.
+
+    Пока идёт запись, юзер может начать следующую операцию — её состояние
+    и данные фоновая задача трогать не должна.
+    """
+    current_state, data = await asyncio.gather(state.get_state(), state.get_data())
+    return current_state is None and data.get("confirm_message_id") == message_id
+
+
+async def _edit_result(
+    bot: Bot,
+    chat_id: int,
+    message_id: int,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+) -> None:
+    """Итоговая правка сообщения; ошибка Telegram не роняет фоновую задачу."""
+    try:
         await bot.edit_message_text(
             chat_id=chat_id,
             message_id=message_id,
-            text=MSG_TRANSFER_SUCCESS.format(info=info),
-            parse_mode="HTML",
-        )
-        await bot.send_message(chat_id, MSG_NEXT_OPERATION)
-        await reset_state(state)
-    except Exception as error:  # noqa: BLE001
-        log.error(f"Ошибка при добавлении операции: {error}")
-        await bot.edit_message_text(
-            chat_id=chat_id,
-            message_id=message_id,
-            text=MSG_TRANSFER_ERROR.format(info=info, error=error),
-            parse_mode="HTML",
+            text=text,
+            reply_markup=reply_markup,
         )
+    except TelegramAPIError as error:
+        log.warning("Не удалось обновить сообщение {}: {}", message_id, error)
+
 
-    await cb.answer()
+async def drain_background_tasks() -> None:
+    """Дождаться незавершённых записей перемещений (вызывается при остановке бота)."""
+    if _background_tasks:
+        log.info("Ожидаем сохранения перемещений: {}", len(_background_tasks))
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
 
 # ──────────────────────── ОТКЛОНЕНИЕ (NO) ────────────────────────────────
 @router.callback_query(
-    TransferConfirmCallback.filter(F.action == "no"),
     OperationState.confirming_operation,
+    TransferConfirmCallback.filter(F.action == "no"),
 )
-@track_messages
 async def confirm_no(
     cb: CallbackQuery,
     state: FSMContext,
@@ -229,19 +313,20 @@ async def confirm_no(
     chat_id, message_id = cb.message.chat.id, cb.message.message_id
     info = await format_operation_message(data)
 
-    log.info(f"Юзер {cb.from_user.full_name}: отменил операцию")
-
-    await delete_tracked_messages(bot, state, chat_id)
-    await delete_key_messages(bot, state, chat_id)
+    log.info("Юзер {}: отменил операцию", cb.from_user.full_name)
 
-    await bot.edit_message_text(
-        chat_id=chat_id,
-        message_id=message_id,
-        text=MSG_TRANSFER_CANCEL.format(info=info),
-        parse_mode="HTML",
+    await asyncio.gather(
+        delete_operation_messages(bot, state, chat_id, exclude_message_id=message_id),
+        bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=MSG_TRANSFER_CANCEL.format(info=info),
+        ),
+    )
+    await asyncio.gather(
+        bot.send_message(chat_id, MSG_NEXT_OPERATION),
+        reset_state(state),
+        cb.answer(),
     )
-    await bot.send_message(chat_id, MSG_NEXT_OPERATION)
-    await reset_state(state)
-    await cb.answer()
 
 # ──────────────────────────────────────────────────────────────────────────
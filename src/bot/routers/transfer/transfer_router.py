@@ -14,18 +14,18 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Final, Tuple
 
 from aiogram import Bot, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.bot.keyboards.wallet_kb import WalletCallback, create_wallet_keyboard
 from src.bot.state import OperationState
 from src.bot.utils.legacy_messages import track_messages
 from src.core.logger import configure_logger
-from src.db import get_async_session, get_wallet
+from src.db import get_async_session, get_wallet_number
 
 # ─────────────────────────── ТЕКСТОВЫЕ КОНСТАНТЫ ────────────────────────────
 EMOJI_FROM:   Final = "🟢"
@@ -71,11 +71,10 @@ async def _get_choose_to_wallet_message(
     state: FSMContext,
 ) -> Tuple[str, InlineKeyboardMarkup]:
     """Текст и клавиатура для выбора *целевого* кошелька."""
+    data = await state.get_data()
     async with get_async_session() as session:
-        data = await state.get_data()
-        from_wallet = data.get("from_wallet")
         kb = await create_wallet_keyboard(
-            session, state=state, exclude_wallet=from_wallet
+            session, state=state, exclude_wallet=data.get("from_wallet")
         )
     return MSG_CHOOSE_TO_WALLET, kb
 
@@ -86,7 +85,7 @@ def _get_enter_amount_message() -> str:
 
 
 # ─────────────────────── ВЫБОР ИСХОДНОГО КОШЕЛЬКА ─────────────────────────
-@router.callback_query(WalletCallback.filter(), OperationState.choosing_from_wallet)
+@router.callback_query(OperationState.choosing_from_wallet, WalletCallback.filter())
 @track_messages
 async def set_from_wallet(
     cb: CallbackQuery,
@@ -95,35 +94,43 @@ async def set_from_wallet(
     callback_data: WalletCallback,  # noqa: ARG001
 ) -> None:
     """Сохраняет выбранный *исходный* кошелёк и переходит к выбору целевого."""
+    await cb.answer()  # снимаем «часики» сразу, остальное юзер видит по сообщениям
     wallet_id = callback_data.wallet_id
+    # номер кошелька и клавиатура следующего шага — в одной сессии
     async with get_async_session() as session:
-        wallet = await get_wallet(session, wallet_id)
-        wallet_number = wallet.wallet_number if wallet else wallet_id
-
-    await state.update_data(
-        from_wallet=wallet_id,
-        state_history=[OperationState.choosing_from_wallet.state],
-    )
+        wallet_number = await get_wallet_number(wallet_id, session)
+        kb = await create_wallet_keyboard(
+            session, state=state, exclude_wallet=wallet_id
+        )
     log.info(
-        f"Юзер {cb.from_user.full_name}: выбран from_wallet – {wallet_id}, "
-        f"кошелёк – {wallet_number}"
+        "Юзер {}: выбран from_wallet – {}, "
+        "кошелёк – {}",
+        cb.from_user.full_name,
+        wallet_id,
+        wallet_number,
     )
 
-    # Обновляем сообщение с подтверждением выбора исходного кошелька
+    # Подтверждаем выбор в текущем сообщении и сразу присылаем выбор целевого
     confirm_text = MSG_CONFIRM_FROM_WALLET.format(wallet_number=wallet_number)
-    await cb.message.edit_text(confirm_text, reply_markup=None)
-
-    # Запрашиваем выбор целевого кошелька
-    text, kb = await _get_choose_to_wallet_message(cb, state)
-    new_message = await bot.send_message(cb.message.chat.id, text, reply_markup=kb)
-    await state.update_data(to_wallet_message_id=new_message.message_id)
+    _, new_message = await asyncio.gather(
+        cb.message.edit_text(confirm_text, reply_markup=None),
+        bot.send_message(cb.message.chat.id, MSG_CHOOSE_TO_WALLET, reply_markup=kb),
+    )
 
-    await state.set_state(OperationState.choosing_to_wallet)
-    await cb.answer()
+    # все поля шага — одной записью в FSM; состояние лежит в отдельном ключе
+    await asyncio.gather(
+        state.update_data(
+            from_wallet=wallet_id,
+            from_wallet_label=wallet_number,
+            state_history=[OperationState.choosing_from_wallet.state],
+            to_wallet_message_id=new_message.message_id,
+        ),
+        state.set_state(OperationState.choosing_to_wallet),
+    )
 
 
 # ─────────────────────── ВЫБОР ЦЕЛЕВОГО КОШЕЛЬКА ─────────────────────────
-@router.callback_query(WalletCallback.filter(), OperationState.choosing_to_wallet)
+@router.callback_query(OperationState.choosing_to_wallet, WalletCallback.filter())
 @track_messages
 async def set_to_wallet(
     cb: CallbackQuery,
@@ -132,35 +139,34 @@ async def set_to_wallet(
     callback_data: WalletCallback,  # noqa: ARG001
 ) -> None:
     """Сохраняет выбранный *целевой* кошелёк и запрашивает сумму."""
+    await cb.answer()
     wallet_id = callback_data.wallet_id
-    async with get_async_session() as session:
-        wallet = await get_wallet(session, wallet_id)
-        wallet_number = wallet.wallet_number if wallet else wallet_id
-
-    await state.update_data(
-        to_wallet=wallet_id,
-        state_history=[OperationState.choosing_to_wallet.state],
-    )
+    wallet_number = await get_wallet_number(wallet_id)
     log.info(
-        f"Юзер {cb.from_user.full_name}: выбран to_wallet – {wallet_id}, "
-        f"кошелёк – {wallet_number}"
+        "Юзер {}: выбран to_wallet – {}, "
+        "кошелёк – {}",
+        cb.from_user.full_name,
+        wallet_id,
+        wallet_number,
     )
 
-    # Обновляем сообщение с подтверждением выбора целевого кошелька
+    # Подтверждаем выбор и запрашиваем сумму перевода
     confirm_text = MSG_CONFIRM_TO_WALLET.format(wallet_number=wallet_number)
-    await cb.message.edit_text(confirm_text, reply_markup=None)
-
-    # Запрашиваем сумму перевода
-    amount_message = await bot.send_message(
-        cb.message.chat.id, _get_enter_amount_message()
+    _, amount_message = await asyncio.gather(
+        cb.message.edit_text(confirm_text, reply_markup=None),
+        bot.send_message(cb.message.chat.id, _get_enter_amount_message()),
     )
 
-    amoount_message_id = amount_message.message_id
-    await state.update_data(amount_message_id=amoount_message_id)
-
-    log.warning(f"amount_message_id={amoount_message_id}")
-
-    await state.set_state(OperationState.entering_operation_amount)
-    await cb.answer()
+    amount_message_id = amount_message.message_id
+    await asyncio.gather(
+        state.update_data(
+            to_wallet=wallet_id,
+            to_wallet_label=wallet_number,
+            state_history=[OperationState.choosing_to_wallet.state],
+            amount_message_id=amount_message_id,
+            amount_prompt_id=amount_message_id,
+        ),
+        state.set_state(OperationState.entering_operation_amount),
+    )
 
 # ─────────────────────────────────────────────────────────────────────────
@@ -1,3 +1,3 @@
 # -*- coding: utf-8 -*-
 # FinFlow/src/bot/state/__init__.py
-from .operation_state import OperationState, reset_state
\ No newline at end of file
+from .operation_state import OperationState, reset_state, push_state_history, push_state_step
\ No newline at end of file
@@ -1,13 +1,14 @@
 # -*- coding: utf-8 -*-
 # FinFlow/src/bot/state/operation_state.py
-import json
 from datetime import timedelta
 
+import orjson
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.storage.redis import RedisStorage
 from redis.asyncio.client import Redis
 
+from src.bot.utils.ref_cache import drop_ref_cache
 from src.core.config import get_settings
 
 # ───────────────────── Инициализация RedisStorage ────────────────────────
@@ -23,8 +24,10 @@ storage = RedisStorage(
     redis=redis,
     state_ttl=timedelta(days=7),
     data_ttl=timedelta(days=7),
-    json_loads=json.loads,
-    json_dumps=json.dumps,
+    # FSM‑данные читаются и пишутся на каждом шаге мастера — orjson
+    # кодирует их в разы быстрее stdlib json (bytes Redis принимает как есть)
+    json_loads=orjson.loads,
+    json_dumps=orjson.dumps,
 )
 
 # ─────────────────────────── States Group ────────────────────────────────
@@ -75,24 +78,42 @@ class OperationState(StatesGroup):
     # Шаг 11: подтверждение
     confirming_operation = State()
 
+# ────────────────────────── История «Назад» ──────────────────────────────
+STATE_HISTORY_LIMIT = 16  # глубже мастер не ходит, лишнее не сериализуем
+
+
+def push_state_history(history: list[str] | None, state_name: str) -> list[str]:
+    """Возвращает историю с новым шагом, ограниченную STATE_HISTORY_LIMIT."""
+    return [*(history or ()), state_name][-STATE_HISTORY_LIMIT:]
+
+
+async def push_state_step(state: FSMContext, state_name: str, **updates) -> dict:
+    """Добавляет шаг в историю и пишет `updates` за одно чтение и одну запись.
+
+    `update_data` сам перечитывает данные из хранилища; здесь они уже
+    прочитаны, поэтому пишем готовый словарь через `set_data`.
+    Возвращает итоговые данные FSM.
+    """
+    data = await state.get_data()
+    data["state_history"] = push_state_history(data.get("state_history"), state_name)
+    data.update(updates)
+    await state.set_data(data)
+    return data
+
 # ─────────────────────────── reset_state ─────────────────────────────────
 async def reset_state(state: FSMContext, clear_history: bool = True) -> None:
-    """Полный сброс FSM ‑данных пользователя."""
-    current_data = await state.get_data()
-    preserved_keys = {"messages_to_delete"}
-    if not clear_history:
-        preserved_keys.add("state_history")
+    """Полный сброс FSM ‑данных пользователя.
 
-    reset_data = {k: None for k in current_data if k not in preserved_keys}
-    update_data = {
+    Данные не обнуляются поключно, а заменяются целиком: переносятся только
+    список сообщений на удаление и (по желанию) история «Назад».
+    Отсутствующий ключ читается через `.get()` так же, как None.
+    """
+    current_data = await state.get_data()
+    reset_data = {
         "state_history": [] if clear_history else current_data.get("state_history", []),
-        "contractor_name": None,
-        "material_name": None,
-        "employee_name": None,
-        "outcome_article_creditor": None,
-        "outcome_founder": None,
-        "saving_coeff": None,       # сбрасываем новый коэффициент
     }
-    update_data.update(reset_data)
-    await state.update_data(**update_data)
+    if "messages_to_delete" in current_data:
+        reset_data["messages_to_delete"] = current_data["messages_to_delete"]
+    await state.set_data(reset_data)
     await state.set_state(None)
+    drop_ref_cache(state)
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 # FinFlow/src/bot/utils/legacy_messages.py
+import asyncio
 from functools import wraps
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Set
 
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
@@ -47,6 +48,62 @@ SUMMARY_MESSAGE_KEY = "summary_message_id"
 # Список временных сообщений для удаления
 TRACKING_KEY = "messages_to_delete"
 
+# Лимит Bot API на число ID в одном deleteMessages
+DELETE_BATCH_LIMIT = 100
+
+# Все поля с ID ключевых сообщений (без дублей) — для быстрой проверки «есть ли что удалять»
+_KEY_MESSAGE_KEYS = (*dict.fromkeys(KEY_MESSAGE_FIELDS.values()), SUMMARY_MESSAGE_KEY)
+
+# get_state() возвращает строку — ищем по обычному str‑словарю, без State.__eq__
+_KEY_MESSAGE_FIELDS_BY_STR = {st.state: field for st, field in KEY_MESSAGE_FIELDS.items()}
+
+
+async def _delete_messages(bot: Bot, chat_id: int, message_ids: List[int]) -> None:
+    """Удаляет сообщения пакетами `deleteMessages` (до 100 ID за HTTP‑запрос).
+
+    Несуществующие и неудаляемые сообщения Telegram пропускает сам.
+    """
+    ids = list(dict.fromkeys(message_ids))  # без дублей, порядок сохраняем
+    if not ids:
+        return
+    chunks = [ids[i:i + DELETE_BATCH_LIMIT] for i in range(0, len(ids), DELETE_BATCH_LIMIT)]
+    results = await asyncio.gather(
+        *(bot.delete_messages(chat_id=chat_id, message_ids=chunk) for chunk in chunks),
+        return_exceptions=True,
+    )
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, TelegramBadRequest):
+            # пакет отклонён целиком — удаляем по одному, чтобы не терять остальные
+            log.debug("Batch delete of {} rejected ({}), deleting one by one", chunk, result)
+            await _delete_messages_one_by_one(bot, chat_id, chunk)
+        elif isinstance(result, Exception):
+            log.warning("Failed to delete messages {}: {}", chunk, result)
+        else:
+            log.debug("Deleted messages {}", chunk)
+
+
+async def _delete_messages_one_by_one(bot: Bot, chat_id: int, message_ids: List[int]) -> None:
+    """Запасной путь для `_delete_messages`: `deleteMessage` на каждый ID."""
+    results = await asyncio.gather(
+        *(bot.delete_message(chat_id=chat_id, message_id=mid) for mid in message_ids),
+        return_exceptions=True,
+    )
+    for message_id, result in zip(message_ids, results):
+        if isinstance(result, Exception):
+            log.debug("Failed to delete message {}: {}", message_id, result)
+
+
+def _key_message_ids(data: dict, current_state: Optional[str], exclude_ids: Set[int]) -> List[int]:
+    """ID ключевых сообщений и сводки, подлежащих удалению."""
+    # Удаляем только сообщения финального состояния (confirming_operation), сохраняя сводку и сумму до этого
+    if current_state != OperationState.confirming_operation.state:
+        return []
+    return [
+        message_id
+        for message_id in (data.get(key) for key in _KEY_MESSAGE_KEYS)
+        if message_id and message_id not in exclude_ids
+    ]
+
 
 async def delete_key_messages(
     bot: Bot,
@@ -64,63 +121,56 @@ async def delete_key_messages(
         exclude_message_id (Optional[int]): ID сообщения, которое не следует удалять (устаревший параметр).
         exclude_message_ids (Optional[List[int]]): Список ID сообщений, которые не следует удалять.
     """
-    data = await state.get_data()
+    # ключевые сообщения удаляются только на подтверждении — до тех пор
+    # не читаем ни данные FSM, ни список полей
     current_state = await state.get_state()
-    exclude_ids = set()
+    if current_state != OperationState.confirming_operation.state:
+        return
 
-    # Формируем множество исключений
-    if exclude_message_ids is not None:
-        exclude_ids.update(exclude_message_ids)
+    data = await state.get_data()
+    if not any(data.get(key) for key in _KEY_MESSAGE_KEYS):
+        return  # ни одного ключевого сообщения — нечего удалять
+
+    exclude_ids = set(exclude_message_ids or ())
     if exclude_message_id is not None:
         exclude_ids.add(exclude_message_id)
 
-    # # Всегда добавляем date_message_id в исключения, если оно существует
-    # date_message_id = data.get("date_message_id")
-    # if date_message_id:
-    #     exclude_ids.add(date_message_id)
-
-    # Удаляем только сообщения финального состояния (confirming_operation), сохраняя сводку и сумму до этого
-    for state_key, message_key in KEY_MESSAGE_FIELDS.items():
-        message_id = data.get(message_key)
-        if message_id and message_id not in exclude_ids and current_state == OperationState.confirming_operation.state:
-            try:
-                await bot.delete_message(chat_id, message_id)
-                log.debug(f"Deleted key message with ID {message_id} for state {state_key}")
-            except TelegramBadRequest as e:
-                if "message can't be deleted" not in str(e).lower() and "message to delete not found" not in str(e).lower():
-                    log.warning(f"Failed to delete message {message_id}: {str(e)}")
-            except Exception as e:
-                log.warning(f"Unexpected error deleting message {message_id}: {str(e)}")
-
-    # Удаляем сводку только на финальном этапе
-    summary_message_id = data.get(SUMMARY_MESSAGE_KEY)
-    if summary_message_id and summary_message_id not in exclude_ids and current_state == OperationState.confirming_operation.state:
-        try:
-            await bot.delete_message(chat_id, summary_message_id)
-            log.debug(f"Deleted summary message with ID {summary_message_id}")
-        except TelegramBadRequest as e:
-            if "message can't be deleted" not in str(e).lower() and "message to delete not found" not in str(e).lower():
-                log.warning(f"Failed to delete summary message {summary_message_id}: {str(e)}")
-        except Exception as e:
-            log.warning(f"Unexpected error deleting summary message {summary_message_id}: {str(e)}")
+    await _delete_messages(bot, chat_id, _key_message_ids(data, current_state, exclude_ids))
 
 
 async def delete_tracked_messages(bot: Bot, state: FSMContext, chat_id: int, exclude_message_id: int = None) -> None:
     """Удаляет временные сообщения из списка messages_to_delete."""
     data = await state.get_data()
     messages_to_delete = data.get(TRACKING_KEY, [])
-    for message_id in messages_to_delete[:]:  # Копируем список для безопасного удаления
-        if exclude_message_id and message_id == exclude_message_id:
-            continue  # Пропускаем сообщение, которое нужно сохранить
-        try:
-            await bot.delete_message(chat_id, message_id)
-        except Exception:
-            pass
-    if exclude_message_id:
-        messages_to_delete = [mid for mid in messages_to_delete if mid != exclude_message_id]
-    else:
-        messages_to_delete = []
-    await state.update_data({TRACKING_KEY: messages_to_delete})
+    if not messages_to_delete:
+        return  # список пуст — ни API‑вызовов, ни записи в FSM
+
+    await _delete_messages(bot, chat_id, [mid for mid in messages_to_delete if mid != exclude_message_id])
+    # в списке остаётся разве что исключённое сообщение (одна запись, без дублей)
+    keep = [exclude_message_id] if exclude_message_id in messages_to_delete else []
+    await state.update_data({TRACKING_KEY: keep})
+
+
+async def delete_operation_messages(
+    bot: Bot,
+    state: FSMContext,
+    chat_id: int,
+    exclude_message_id: Optional[int] = None,
+) -> None:
+    """Временные и ключевые сообщения операции — одним пакетным удалением.
+
+    Эквивалент `delete_tracked_messages` + `delete_key_messages`, но с одним
+    чтением FSM и одним `deleteMessages` вместо двух серий запросов.
+    `exclude_message_id` — сообщение, которое редактируется параллельно
+    (итог подтверждения), его не трогаем.
+    """
+    data, current_state = await asyncio.gather(state.get_data(), state.get_state())
+    exclude_ids = {exclude_message_id} if exclude_message_id else set()
+    tracked = [mid for mid in data.get(TRACKING_KEY, []) if mid not in exclude_ids]
+    key_ids = _key_message_ids(data, current_state, exclude_ids)
+    await _delete_messages(bot, chat_id, [*tracked, *key_ids])
+    if tracked:
+        await state.update_data({TRACKING_KEY: []})
 
 
 def track_messages(func: Callable) -> Callable:
@@ -128,14 +178,18 @@ def track_messages(func: Callable) -> Callable:
 
     @wraps(func)
     async def wrapper(event: Message | CallbackQuery, state: FSMContext, bot: Bot, *args, **kwargs):
-        current_state = await state.get_state()
         chat_id = event.chat.id if isinstance(event, Message) else event.message.chat.id
         if isinstance(event, Message):
-            if current_state in KEY_MESSAGE_FIELDS:
-                await state.update_data({KEY_MESSAGE_FIELDS[current_state]: event.message_id})
-            messages_to_delete = (await state.get_data()).get(TRACKING_KEY, [])
-            messages_to_delete.append(event.message_id)
-            await state.update_data({TRACKING_KEY: messages_to_delete})
+            # ключевое поле и список на удаление — одно чтение и одна запись;
+            # состояние и данные лежат в разных ключах Redis, читаем их параллельно
+            current_state, data = await asyncio.gather(state.get_state(), state.get_data())
+            key_field = _KEY_MESSAGE_FIELDS_BY_STR.get(current_state)
+            if key_field:
+                data[key_field] = event.message_id
+            tracked = data.get(TRACKING_KEY, [])
+            if event.message_id not in tracked:  # повторный вызов не плодит дубли
+                data[TRACKING_KEY] = [*tracked, event.message_id]
+            await state.set_data(data)
         result = await func(event, state, bot, *args, **kwargs)
         await delete_tracked_messages(bot, state, chat_id)
         return result
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# FinFlow/src/bot/utils/ref_cache.py
+"""
+Кэш подписей справочников в пределах одного мастера операции.
+
+Сводка выбытия перерисовывается на каждом шаге и каждый раз заново
+запрашивает кошелёк, проект, статью … Кэш хранит уже полученные подписи
+по ключу (вид, id) для конкретного пользователя, поэтому в БД уходят
+только новые ID. Живёт в памяти процесса (FSM‑хранилище сериализует
+данные в JSON) и сбрасывается в `reset_state` либо по TTL.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db import fetch_refs, get_async_session
+from src.db.service.cache import TTLCache
+
+
+class RefCache:
+    """Мемоизация `fetch_refs` по ключу (вид, id)."""
+
+    def __init__(self) -> None:
+        self._labels: Dict[Tuple[str, Any], Optional[str]] = {}
+
+    async def get(
+        self, session: Optional[AsyncSession], **ids: Any
+    ) -> Dict[str, Optional[str]]:
+        """
+        Аналог `fetch_refs`, но недостающие подписи догружаются одним запросом.
+
+        Args:
+            session: Асинхронная сессия БД; None — открыть свою, и только
+                если в кэше чего‑то не хватает.
+            **ids: Те же именованные аргументы, что и у `fetch_refs`
+                (`wallet_id=…`, `article_id=…`).
+
+        Returns:
+            Словарь {"wallet": "<номер>", …} для всех переданных ID.
+        """
+        refs: Dict[str, Optional[str]] = {}
+        missing: Dict[str, Any] = {}
+        for arg, ref_id in ids.items():
+            if ref_id is None:
+                continue
+            kind = arg.removesuffix("_id")
+            if (kind, ref_id) in self._labels:
+                refs[kind] = self._labels[(kind, ref_id)]
+            else:
+                missing[arg] = ref_id
+
+        if missing:
+            if session is None:
+                async with get_async_session() as session:
+                    fetched = await fetch_refs(session, **missing)
+            else:
+                fetched = await fetch_refs(session, **missing)
+            for kind, label in fetched.items():
+                self._labels[(kind, missing[f"{kind}_id"])] = label
+            refs.update(fetched)
+        return refs
+
+    def label(self, kind: str, ref_id: Any) -> Optional[str]:
+        """Уже загруженная подпись (None, если её ещё не запрашивали)."""
+        return self._labels.get((kind, ref_id))
+
+
+# Брошенный мастер до reset_state не доходит — такие кэши вытесняются по
+# TTL и по размеру (LRU). TTL тот же, что у кэшей справочников: подпись,
+# переименованная во время мастера, устаревает не дольше, чем там
+_caches = TTLCache(maxsize=1024, ttl=300)
+
+
+def get_ref_cache(state: FSMContext) -> RefCache:
+    """Кэш текущего пользователя (создаётся лениво)."""
+    cache = _caches.get(state.key)
+    if cache is None:
+        cache = _caches[state.key] = RefCache()
+    return cache
+
+
+def drop_ref_cache(state: FSMContext) -> None:
+    """Сбросить кэш пользователя (конец или отмена мастера)."""
+    _caches.pop(state.key, None)
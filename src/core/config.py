@@ -7,11 +7,12 @@ Reads variables from `.env.*` or the real environment and exposes them via the
 `get_settings()` singleton.  Compatible with Pydantic-Settings ≥2.1.
 """
 import json
+import os
 import platform
 import re
-from functools import lru_cache
+from functools import cached_property
 from pathlib import Path
-from typing import Literal, List
+from typing import Literal, List, Optional
 from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
@@ -29,21 +30,28 @@ logger = configure_logger(prefix="CFG", color="yellow", level="DEBUG")
 project_root = Path(__file__).resolve().parents[2]
 env_dev = project_root / ".env.dev"
 env_prod = project_root / ".env.prod"
-env_file = None
 
-# Определяем ОС
-if platform.system() == "Windows":
+# Явно заданный ENV_FILE — без перебора кандидатов на диске
+env_file = os.environ.get("ENV_FILE")
+if env_file:
+    env_file = Path(env_file)
+elif platform.system() == "Windows":  # Определяем ОС
     env_file = env_dev if env_dev.exists() else project_root / ".env"
 else:  # Предполагаем Linux для prod
     env_file = env_prod if env_prod.exists() else project_root / ".env"
 
-if env_file and env_file.exists():
-    load_dotenv(env_file)
-    logger.debug(f"Loaded environment variables from {env_file}")
+# load_dotenv сам сообщает, нашёлся ли файл — отдельный exists() не нужен
+if load_dotenv(env_file):
+    logger.debug("Loaded environment variables from {}", env_file)
 else:
     logger.warning("No .env file found, using default environment variables")
 
 
+_INT_RE = re.compile(r"\d+")
+# скобки, «;» и пробельные символы → запятая: "[1, 2; 3]" → ",1,,2,,3,"
+_SEP_TABLE = str.maketrans(dict.fromkeys("[];, \t\r\n", ","))
+
+
 # Кастомный валидатор для преобразования строки в список целых чисел
 def parse_int_list(v: str) -> list[int]:
     if not v or v.strip() == "":
@@ -51,19 +59,19 @@ def parse_int_list(v: str) -> list[int]:
 
     v = v.strip()
 
-    # ① JSON‑список: "[1,2,3]"
-    if v.startswith("[") and v.endswith("]"):
+    # ① JSON со строками / экранированием: '["1","2"]' — только через json
+    if v[0] == "[" and ('"' in v or "\\" in v):
         try:
             return [int(x) for x in json.loads(v)]
-        except (json.JSONDecodeError, ValueError):
-            pass  # если не получилось – пробуем как CSV ниже
+        except (json.JSONDecodeError, ValueError, TypeError):
+            pass  # если не получилось – пробуем общий разбор ниже
 
-    # ② Простой CSV: "1,2,3"
+    # ② "[1,2,3]", "1,2,3", "1; 2 ; 3" — один проход translate + split
     try:
-        return [int(x.strip()) for x in v.split(",") if x.strip()]
+        return [int(t) for t in v.translate(_SEP_TABLE).split(",") if t]
     except ValueError:
-        # ③ На всякий случай: извлекаем все цифры регуляркой "1; 2 ; 3"
-        numbers = re.findall(r"\d+", v)
+        # ③ На всякий случай: извлекаем все цифры регуляркой
+        numbers = _INT_RE.findall(v)
         if numbers:
             return list(map(int, numbers))
 
@@ -93,6 +101,10 @@ class Settings(BaseSettings):
     postgres_db: str = Field(..., alias="POSTGRES_DB")
     postgres_host: str = Field(..., alias="POSTGRES_HOST")
     postgres_port: int = Field(..., alias="POSTGRES_PORT")
+    db_pool_size: int = Field(20, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(40, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: int = Field(30, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
 
     # ---- Redis ------------------------------------------------------------ #
     redis_user: str = Field("default", alias="REDIS_USER")
@@ -110,6 +122,17 @@ class Settings(BaseSettings):
     financial_outcome_article_codes_raw: str = Field(..., alias="FINANCIAL_OUTCOME_ARTICLE_CODES")
 
     # ---- Computed --------------------------------------------------------- #
+    def model_post_init(self, __context) -> None:
+        # Коды статей разбираем сразу при создании Settings (get_settings
+        # кэширует экземпляр): ошибка формата всплывает на старте, а не на
+        # первом нажатии, и хендлеры читают уже готовые списки.
+        for name in (
+            "income_article_codes",
+            "project_outcome_article_codes",
+            "operational_outcome_article_codes",
+            "financial_outcome_article_codes",
+        ):
+            getattr(self, name)
 
     @property
     def database_url(self) -> str:
@@ -136,19 +159,19 @@ class Settings(BaseSettings):
             path="0",  # база 0
         )
 
-    @property
+    @cached_property
     def income_article_codes(self) -> list[int]:
         return parse_int_list(self.income_article_codes_raw)
 
-    @property
+    @cached_property
     def project_outcome_article_codes(self) -> list[int]:
         return parse_int_list(self.project_outcome_article_codes_raw)
 
-    @property
+    @cached_property
     def operational_outcome_article_codes(self) -> list[int]:
         return parse_int_list(self.operational_outcome_article_codes_raw)
 
-    @property
+    @cached_property
     def financial_outcome_article_codes(self) -> list[int]:
         return parse_int_list(self.financial_outcome_article_codes_raw)
 
@@ -156,9 +179,15 @@ class Settings(BaseSettings):
 # --------------------------------------------------------------------------- #
 # Singleton accessor                                                         #
 # --------------------------------------------------------------------------- #
-@lru_cache(maxsize=1)
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    """Return cached Settings instance."""
+    """Return the process-wide Settings instance (built on first call)."""
+    global _settings
+    if _settings is not None:
+        return _settings
+
     try:
         settings = Settings()  # type: ignore[call-arg]
     except ValidationError as exc:  # pragma: no cover
@@ -170,4 +199,5 @@ def get_settings() -> Settings:
         f"db={settings.postgres_user}@{settings.postgres_host}:"
         f"{settings.postgres_port}/{settings.postgres_db}"
     )
+    _settings = settings
     return settings
\ No newline at end of file
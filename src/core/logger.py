@@ -1,8 +1,45 @@
 # -*- coding: utf-8 -*-
 # FinFlow/src/core/logger.py
 
+import sys
+
 from loguru import logger
 
+# Minimum level per bound logger (see configure_logger / is_level_enabled)
+_min_levels: dict[object, int] = {}
+_configured: bool = False
+
+
+def _format(record) -> str:
+    """Per-record format: colour and prefix come from the bound `extra`."""
+    color = record["extra"]["color"]
+    return (
+        f"<{color}>{{time:YYYY-MM-DD HH:mm:ss.SSS}}</{color}> | "
+        "<b>{level:<4}</b> | "
+        f"<{color}>{{extra[prefix]}}</{color}> | "
+        "<cyan>{name}:{function}:{line}</cyan> | "
+        "<b>{message}</b>\n{exception}"
+    )
+
+
+def _setup_handler() -> None:
+    """Install the single global handler (once per process)."""
+    global _configured
+    if _configured:
+        return
+
+    logger.remove()
+    logger.configure(extra={"prefix": "APP", "color": "green", "min_level": 0})
+    logger.add(
+        sys.stdout,  # loguru пишет в поток напрямую, без print
+        level=0,
+        # уровень проверяется по логгеру модуля, а не по общему хендлеру
+        filter=lambda record: record["level"].no >= record["extra"]["min_level"],
+        format=_format,
+        colorize=True,
+    )
+    _configured = True
+
 
 def configure_logger(
     prefix: str = "APP",
@@ -10,31 +47,34 @@ def configure_logger(
     level: str = "DEBUG"
 ) -> logger.__class__:
     """
-    Return a customised Loguru logger instance.
+    Return a Loguru logger bound to a module prefix.
+
+    The handler is installed once; every call only binds its own prefix,
+    colour and minimum level, so modules no longer override each other.
 
     Args:
         prefix: Short label added to every message.
         color: Any Loguru‑supported colour name.
-        level: Minimum log level captured by the handler.
+        level: Minimum log level for messages of this logger.
 
     Returns:
-        Configured `loguru.logger` instance.
+        Bound `loguru.logger` instance.
     """
+    _setup_handler()
+    level_no = logger.level(level).no
+    bound = logger.bind(prefix=prefix, color=color, min_level=level_no)
+    _min_levels[bound] = level_no
+    return bound
 
-    # Удаляем все существующие хендлеры
-    logger.remove()
 
-    # Добавляем единственный нужный хендлер
-    logger.add(
-        lambda msg: print(msg, end=""),
-        level=level,
-        format=(
-            f"<{color}>{{time:YYYY-MM-DD HH:mm:ss.SSS}}</{color}> | "
-            "<b>{level:<4}</b> | "
-            "<cyan>{name}:{function}:{line}</cyan> | "
-            f"<b>{{message}}</b>"
-        ),
-        colorize=True,
-    )
+def is_level_enabled(log: logger.__class__, level: str) -> bool:
+    """
+    Check whether a message of `level` sent through `log` would be emitted.
+
+    Lets callers skip work (e.g. a DB lookup) whose only consumer is a log line.
 
-    return logger
+    Args:
+        log: Logger returned by `configure_logger`.
+        level: Loguru level name.
+    """
+    return logger.level(level).no >= _min_levels.get(log, 0)
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 # FinFlow/src/db/models/__init__.py
-from .articles import Article, create_article, get_article, get_articles, update_article, delete_article
-from .contractors import Contractor, create_contractor, get_contractor, get_contractors, update_contractor, delete_contractor
-from .creditors import Creditor, create_creditor, get_creditor, get_creditors, update_creditor, delete_creditor
-from .employees import Employee, create_employee, get_employee, get_employees, update_employee, delete_employee
-from .founders import Founder, create_founder, get_founder, get_founders, update_founder, delete_founder
-from .materials import Material, create_material, get_material, get_materials, update_material, delete_material
-from .projects import Project, create_project, get_project, get_projects, update_project, delete_project
-from .wallets import Wallet, create_wallet, get_wallet, get_wallets, update_wallet, delete_wallet
\ No newline at end of file
+from .articles import Article, create_article, get_article, get_article_cached, get_articles, get_articles_with_stats, get_articles_cached, update_article, delete_article, invalidate_article
+from .contractors import Contractor, create_contractor, get_contractor, get_contractor_cached, get_contractors, get_contractors_cached, update_contractor, delete_contractor, invalidate_contractor
+from .creditors import Creditor, create_creditor, get_creditor, get_creditor_cached, get_creditors, get_creditors_cached, update_creditor, delete_creditor, invalidate_creditor
+from .employees import Employee, create_employee, get_employee, get_employee_cached, get_employees, get_employees_cached, update_employee, delete_employee, invalidate_employee
+from .founders import Founder, create_founder, get_founder, get_founder_cached, get_founders, get_founders_cached, update_founder, delete_founder, invalidate_founder
+from .materials import Material, create_material, get_material, get_material_cached, get_materials, get_materials_cached, update_material, delete_material, invalidate_material
+from .projects import Project, create_project, get_project, get_project_cached, get_projects, get_projects_cached, update_project, delete_project, invalidate_project
+from .wallets import Wallet, create_wallet, get_wallet, get_wallet_cached, peek_wallet, get_wallet_number, get_wallets, get_wallets_cached, update_wallet, delete_wallet, invalidate_wallet
+from .refs import fetch_refs
\ No newline at end of file
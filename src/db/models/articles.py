@@ -21,10 +21,12 @@ from typing import List, Optional
 
 from sqlalchemy import CheckConstraint, Integer, String
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 from src.core.logger import configure_logger
 
 logger = configure_logger(prefix="ARTICLES", color="blue", level="INFO")
@@ -55,8 +57,10 @@ class Article(Base):
         doc="Короткое название статьи (до 48 символов)"
     )
 
-    incomes = relationship("Income", back_populates="article", lazy="selectin")
-    outcomes = relationship("Outcome", back_populates="article", lazy="selectin")
+    # операции по статье нужны только отчётам — см. get_articles_with_stats;
+    # справочник (клавиатуры, сводки) не тянет за собой таблицы фактов
+    incomes = relationship("Income", back_populates="article", lazy="raise_on_sql")
+    outcomes = relationship("Outcome", back_populates="article", lazy="raise_on_sql")
 
     __table_args__ = (
         CheckConstraint("code BETWEEN 1 AND 35", name="ck_article_code_range"),
@@ -90,17 +94,18 @@ async def create_article(
     if len(short_name) > 48:
         raise ValueError("short_name must be ≤ 48 characters")
 
-    # Проверка дубликата
-    existing = await session.execute(
-        select(Article).where(Article.code == code)
+    # Дубликат кода отсекает сам PG: один INSERT вместо SELECT + INSERT, без гонки
+    stmt = (
+        pg_insert(Article)
+        .values(code=code, short_name=short_name, name=name)
+        .on_conflict_do_nothing(index_elements=[Article.code])
+        .returning(Article)
     )
-    if existing.scalar_one_or_none():
+    article = (await session.scalars(stmt)).one_or_none()
+    if article is None:
         raise ValueError(f"Article with code={code} already exists")
-
-    article = Article(code=code, short_name=short_name, name=name)
-    session.add(article)
-    await session.flush()
     await session.commit()
+    _cache.invalidate_list()
     logger.info(f"Created Article id={article.article_id} code={code}")
     return article
 
@@ -118,14 +123,34 @@ async def get_article(
     Returns:
         Article или None.
     """
-    res = await session.execute(
+    article = (await session.scalars(
         select(Article).where(Article.article_id == article_id)
-    )
-    article = res.scalar_one_or_none()
-    logger.debug(f"Fetched Article id={article_id}: found={article is not None}")
+    )).one_or_none()
+    logger.debug("Fetched Article id={}: found={}", article_id, article is not None)
     return article
 
 
+async def get_article_cached(
+    session: AsyncSession, article_id: int
+) -> Optional[Article]:
+    """
+    То же, что get_article, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        article_id: Идентификатор записи.
+
+    Returns:
+        Объект Article или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, article_id)
+
+
+def invalidate_article(article_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_article_cached / get_articles_cached: запись или целиком (None)."""
+    _cache.invalidate(article_id)
+
+
 async def get_articles(session: AsyncSession) -> List[Article]:
     """
     Получить все статьи.
@@ -136,12 +161,45 @@ async def get_articles(session: AsyncSession) -> List[Article]:
     Returns:
         Список Article.
     """
-    res = await session.execute(select(Article))
-    articles = res.scalars().all()
-    logger.debug(f"Fetched {len(articles)} articles")
+    articles = (await session.scalars(select(Article))).all()
+    logger.debug("Fetched {} articles", len(articles))
+    return articles
+
+
+async def get_articles_with_stats(session: AsyncSession) -> List[Article]:
+    """
+    Получить все статьи вместе с их поступлениями и выбытиями.
+
+    Args:
+        session: Асинхронная сессия БД.
+
+    Returns:
+        Список Article с загруженными `incomes` и `outcomes`.
+    """
+    stmt = select(Article).options(
+        selectinload(Article.incomes), selectinload(Article.outcomes)
+    )
+    articles = (await session.scalars(stmt)).all()
+    logger.debug("Fetched {} articles with operations", len(articles))
     return articles
 
 
+_cache = RefTableCache(get_article, get_articles)
+
+
+async def get_articles_cached(session: AsyncSession) -> List[Article]:
+    """
+    То же, что get_articles, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Article; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_article(
     session: AsyncSession, article_id: int, data: dict
 ) -> Optional[Article]:
@@ -163,10 +221,10 @@ async def update_article(
         new_code = data["code"]
         if not (1 <= new_code <= 35):
             raise ValueError("code must be between 1 and 35")
-        dup = await session.execute(
+        dup = await session.scalars(
             select(Article).where(Article.code == new_code, Article.article_id != article_id)
         )
-        if dup.scalar_one_or_none():
+        if dup.one_or_none():
             raise ValueError(f"Article with code={new_code} already exists")
 
     if "short_name" in data and len(data["short_name"]) > 48:
@@ -178,10 +236,10 @@ async def update_article(
         .values(**data)
         .returning(Article)
     )
-    res = await session.execute(stmt)
-    article = res.scalar_one_or_none()
+    article = (await session.scalars(stmt)).one_or_none()
     if article:
         await session.commit()
+        invalidate_article(article_id)
         logger.info(f"Updated Article id={article_id}")
     else:
         logger.warning(f"Article id={article_id} not found for update")
@@ -207,6 +265,7 @@ async def delete_article(
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_article(article_id)
         logger.info(f"Deleted Article id={article_id}")
     else:
         await session.rollback()
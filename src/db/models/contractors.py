@@ -22,15 +22,27 @@ from typing import List, Optional
 
 from sqlalchemy import Integer, String
 from sqlalchemy import select, update, delete
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.logger import configure_logger
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 
 logger = configure_logger(prefix="CONTRACTORS", color="magenta", level="INFO")
 
+# буквы, цифры, пробел, дефис, подчёркивание, точка, запятая
+_NAME_RE = re.compile(r'^[\w\s\-\.,]+\Z')
+
+
+def _validate_name(name: str) -> None:
+    """Проверка имени подрядчика для create/update: непустое, ≤255, допустимые символы."""
+    if not name or len(name) > 255 or not _NAME_RE.match(name):
+        raise ValueError(
+            "name must be non-empty, ≤255 chars, allowed: letters, digits, spaces, '-', '_', '.', ','"
+        )
+
 
 # --------------------------------------------------------------------------- #
 # Contractor Model                                                            #
@@ -53,7 +65,7 @@ class Contractor(Base):
     )
 
     outcomes = relationship(
-        "Outcome", back_populates="contractor", lazy="selectin"
+        "Outcome", back_populates="contractor", lazy="raise_on_sql"
     )
 
 
@@ -73,25 +85,24 @@ async def create_contractor(session: AsyncSession, name: str) -> Contractor:
 
     Raises:
         ValueError: Если name пустое, длиннее 255 символов или содержит недопустимые символы.
-        IntegrityError: Если подрядчик с таким именем уже существует.
+        ValueError: Если подрядчик с таким именем уже существует.
     """
-    # Валидация: непустое, ≤255, допускаем буквы, цифры, пробел, дефис, подчёркивание, точку, запятую
-    if not name or len(name) > 255 or not re.match(r'^[\w\s\-\.,]+$', name):
-        raise ValueError(
-            "name must be non-empty, ≤255 chars, allowed: letters, digits, spaces, '-', '_', '.', ','"
-        )
+    _validate_name(name)
 
-    contractor = Contractor(name=name)
-    session.add(contractor)
-    try:
-        await session.flush()
-        await session.commit()
-        logger.info(f"Created Contractor id={contractor.contractor_id} name={name}")
-        return contractor
-    except IntegrityError as exc:
-        await session.rollback()
-        logger.error(f"Failed to create Contractor name='{name}': {exc}")
-        raise
+    stmt = (
+        pg_insert(Contractor)
+        .values(name=name)
+        .on_conflict_do_nothing(index_elements=[Contractor.name])
+        .returning(Contractor)
+    )
+    contractor = (await session.scalars(stmt)).one_or_none()
+    if contractor is None:
+        logger.error(f"Failed to create Contractor name='{name}': already exists")
+        raise ValueError(f"Contractor with name='{name}' already exists")
+    await session.commit()
+    _cache.invalidate_list()
+    logger.info(f"Created Contractor id={contractor.contractor_id} name={name}")
+    return contractor
 
 
 async def get_contractor(
@@ -108,14 +119,34 @@ async def get_contractor(
         Объект Contractor или None.
     """
     stmt = select(Contractor).where(Contractor.contractor_id == contractor_id)
-    res = await session.execute(stmt)
-    contractor = res.scalar_one_or_none()
+    contractor = (await session.scalars(stmt)).one_or_none()
     logger.debug(
         f"Fetched Contractor id={contractor_id}: found={contractor is not None}"
     )
     return contractor
 
 
+async def get_contractor_cached(
+    session: AsyncSession, contractor_id: int
+) -> Optional[Contractor]:
+    """
+    То же, что get_contractor, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        contractor_id: Идентификатор записи.
+
+    Returns:
+        Объект Contractor или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, contractor_id)
+
+
+def invalidate_contractor(contractor_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_contractor_cached / get_contractors_cached: запись или целиком (None)."""
+    _cache.invalidate(contractor_id)
+
+
 async def get_contractors(session: AsyncSession) -> List[Contractor]:
     """
     Получить список всех подрядчиков.
@@ -127,12 +158,27 @@ async def get_contractors(session: AsyncSession) -> List[Contractor]:
         Список объектов Contractor.
     """
     stmt = select(Contractor)
-    res = await session.execute(stmt)
-    contractors = res.scalars().all()
-    logger.debug(f"Fetched {len(contractors)} contractors")
+    contractors = (await session.scalars(stmt)).all()
+    logger.debug("Fetched {} contractors", len(contractors))
     return contractors
 
 
+_cache = RefTableCache(get_contractor, get_contractors)
+
+
+async def get_contractors_cached(session: AsyncSession) -> List[Contractor]:
+    """
+    То же, что get_contractors, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Contractor; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_contractor(
         session: AsyncSession, contractor_id: int, data: dict
 ) -> Optional[Contractor]:
@@ -152,18 +198,15 @@ async def update_contractor(
     """
     if "name" in data:
         new_name = data["name"]
-        if not new_name or len(new_name) > 255 or not re.match(r'^[\w\s\-\.,]+$', new_name):
-            raise ValueError(
-                "name must be non-empty, ≤255 chars, allowed: letters, digits, spaces, '-', '_', '.', ','"
-            )
+        _validate_name(new_name)
         # Проверка дубликата
-        dup = await session.execute(
+        dup = await session.scalars(
             select(Contractor).where(
                 Contractor.name == new_name,
                 Contractor.contractor_id != contractor_id
             )
         )
-        if dup.scalar_one_or_none():
+        if dup.one_or_none():
             raise ValueError(f"Contractor with name='{new_name}' already exists")
 
     stmt = (
@@ -172,10 +215,10 @@ async def update_contractor(
         .values(**data)
         .returning(Contractor)
     )
-    res = await session.execute(stmt)
-    contractor = res.scalar_one_or_none()
+    contractor = (await session.scalars(stmt)).one_or_none()
     if contractor:
         await session.commit()
+        invalidate_contractor(contractor_id)
         logger.info(f"Updated Contractor id={contractor_id}")
     else:
         await session.rollback()
@@ -199,6 +242,7 @@ async def delete_contractor(session: AsyncSession, contractor_id: int) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_contractor(contractor_id)
         logger.info(f"Deleted Contractor id={contractor_id}")
     else:
         await session.rollback()
@@ -27,6 +27,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import select, update, delete
 
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 from src.core.logger import configure_logger
 
 logger = configure_logger(prefix="CREDITORS", color="cyan", level="INFO")
@@ -52,10 +53,10 @@ class Creditor(Base):
     )
 
     incomes = relationship(
-        "Income", back_populates="creditor", lazy="selectin"
+        "Income", back_populates="creditor", lazy="raise_on_sql"
     )
     outcomes = relationship(
-        "Outcome", back_populates="creditor", lazy="selectin"
+        "Outcome", back_populates="creditor", lazy="raise_on_sql"
     )
 
 
@@ -85,8 +86,8 @@ async def create_creditor(session: AsyncSession, name: str) -> Creditor:
     creditor = Creditor(name=name)
     session.add(creditor)
     try:
-        await session.flush()
         await session.commit()
+        _cache.invalidate_list()
         logger.info(f"Created Creditor id={creditor.creditor_id} name={name}")
         return creditor
     except IntegrityError as exc:
@@ -111,10 +112,31 @@ async def get_creditor(
     stmt = select(Creditor).where(Creditor.creditor_id == creditor_id)
     res = await session.execute(stmt)
     creditor = res.scalar_one_or_none()
-    logger.debug(f"Fetched Creditor id={creditor_id}: found={creditor is not None}")
+    logger.debug("Fetched Creditor id={}: found={}", creditor_id, creditor is not None)
     return creditor
 
 
+async def get_creditor_cached(
+    session: AsyncSession, creditor_id: int
+) -> Optional[Creditor]:
+    """
+    То же, что get_creditor, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        creditor_id: Идентификатор записи.
+
+    Returns:
+        Объект Creditor или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, creditor_id)
+
+
+def invalidate_creditor(creditor_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_creditor_cached / get_creditors_cached: запись или целиком (None)."""
+    _cache.invalidate(creditor_id)
+
+
 async def get_creditors(session: AsyncSession) -> List[Creditor]:
     """
     Получить список всех кредиторов.
@@ -128,10 +150,26 @@ async def get_creditors(session: AsyncSession) -> List[Creditor]:
     stmt = select(Creditor)
     res = await session.execute(stmt)
     creditors = res.scalars().all()
-    logger.debug(f"Fetched {len(creditors)} creditors")
+    logger.debug("Fetched {} creditors", len(creditors))
     return creditors
 
 
+_cache = RefTableCache(get_creditor, get_creditors)
+
+
+async def get_creditors_cached(session: AsyncSession) -> List[Creditor]:
+    """
+    То же, что get_creditors, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Creditor; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_creditor(
     session: AsyncSession, creditor_id: int, data: dict
 ) -> Optional[Creditor]:
@@ -175,6 +213,7 @@ async def update_creditor(
     creditor = res.scalar_one_or_none()
     if creditor:
         await session.commit()
+        invalidate_creditor(creditor_id)
         logger.info(f"Updated Creditor id={creditor_id}")
     else:
         await session.rollback()
@@ -198,6 +237,7 @@ async def delete_creditor(session: AsyncSession, creditor_id: int) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_creditor(creditor_id)
         logger.info(f"Deleted Creditor id={creditor_id}")
     else:
         await session.rollback()
@@ -28,6 +28,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.logger import configure_logger
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 
 logger = configure_logger(prefix="EMPLOYEES", color="yellow", level="INFO")
 
@@ -53,7 +54,7 @@ class Employee(Base):
     )
 
     outcomes = relationship(
-        "Outcome", back_populates="employee", lazy="selectin"
+        "Outcome", back_populates="employee", lazy="raise_on_sql"
     )
 
 
@@ -84,8 +85,8 @@ async def create_employee(session: AsyncSession, name: str) -> Employee:
     employee = Employee(name=name)
     session.add(employee)
     try:
-        await session.flush()
         await session.commit()
+        _cache.invalidate_list()
         logger.info(f"Created Employee id={employee.employee_id} name={name}")
         return employee
     except IntegrityError as exc:
@@ -110,10 +111,31 @@ async def get_employee(
     stmt = select(Employee).where(Employee.employee_id == employee_id)
     res = await session.execute(stmt)
     employee = res.scalar_one_or_none()
-    logger.debug(f"Fetched Employee id={employee_id}: found={employee is not None}")
+    logger.debug("Fetched Employee id={}: found={}", employee_id, employee is not None)
     return employee
 
 
+async def get_employee_cached(
+    session: AsyncSession, employee_id: int
+) -> Optional[Employee]:
+    """
+    То же, что get_employee, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        employee_id: Идентификатор записи.
+
+    Returns:
+        Объект Employee или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, employee_id)
+
+
+def invalidate_employee(employee_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_employee_cached / get_employees_cached: запись или целиком (None)."""
+    _cache.invalidate(employee_id)
+
+
 async def get_employees(session: AsyncSession) -> List[Employee]:
     """
     Получить всех сотрудников.
@@ -127,10 +149,26 @@ async def get_employees(session: AsyncSession) -> List[Employee]:
     stmt = select(Employee)
     res = await session.execute(stmt)
     employees = res.scalars().all()
-    logger.debug(f"Fetched {len(employees)} employees")
+    logger.debug("Fetched {} employees", len(employees))
     return employees
 
 
+_cache = RefTableCache(get_employee, get_employees)
+
+
+async def get_employees_cached(session: AsyncSession) -> List[Employee]:
+    """
+    То же, что get_employees, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Employee; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_employee(
         session: AsyncSession, employee_id: int, data: dict
 ) -> Optional[Employee]:
@@ -174,6 +212,7 @@ async def update_employee(
     employee = res.scalar_one_or_none()
     if employee:
         await session.commit()
+        invalidate_employee(employee_id)
         logger.info(f"Updated Employee id={employee_id}")
     else:
         await session.rollback()
@@ -197,6 +236,7 @@ async def delete_employee(session: AsyncSession, employee_id: int) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_employee(employee_id)
         logger.info(f"Deleted Employee id={employee_id}")
     else:
         await session.rollback()
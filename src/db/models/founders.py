@@ -27,6 +27,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.logger import configure_logger
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 
 logger = configure_logger(prefix="FOUNDERS", color="cyan", level="INFO")
 
@@ -49,8 +50,8 @@ class Founder(Base):
         doc="Наименование учредителя"
     )
 
-    incomes = relationship("Income", back_populates="founder", lazy="selectin")
-    outcomes = relationship("Outcome", back_populates="founder", lazy="selectin")
+    incomes = relationship("Income", back_populates="founder", lazy="raise_on_sql")
+    outcomes = relationship("Outcome", back_populates="founder", lazy="raise_on_sql")
 
 
 # --------------------------------------------------------------------------- #
@@ -79,8 +80,8 @@ async def create_founder(session: AsyncSession, name: str) -> Founder:
     founder = Founder(name=name)
     session.add(founder)
     try:
-        await session.flush()
         await session.commit()
+        _cache.invalidate_list()
         logger.info(f"Created Founder id={founder.founder_id} name={name}")
         return founder
     except IntegrityError as exc:
@@ -105,10 +106,31 @@ async def get_founder(
     stmt = select(Founder).where(Founder.founder_id == founder_id)
     res = await session.execute(stmt)
     founder = res.scalar_one_or_none()
-    logger.debug(f"Fetched Founder id={founder_id}: found={founder is not None}")
+    logger.debug("Fetched Founder id={}: found={}", founder_id, founder is not None)
     return founder
 
 
+async def get_founder_cached(
+    session: AsyncSession, founder_id: int
+) -> Optional[Founder]:
+    """
+    То же, что get_founder, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        founder_id: Идентификатор записи.
+
+    Returns:
+        Объект Founder или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, founder_id)
+
+
+def invalidate_founder(founder_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_founder_cached / get_founders_cached: запись или целиком (None)."""
+    _cache.invalidate(founder_id)
+
+
 async def get_founders(session: AsyncSession) -> List[Founder]:
     """
     Получить всех учредителей.
@@ -122,10 +144,26 @@ async def get_founders(session: AsyncSession) -> List[Founder]:
     stmt = select(Founder)
     res = await session.execute(stmt)
     founders = res.scalars().all()
-    logger.debug(f"Fetched {len(founders)} founders")
+    logger.debug("Fetched {} founders", len(founders))
     return founders
 
 
+_cache = RefTableCache(get_founder, get_founders)
+
+
+async def get_founders_cached(session: AsyncSession) -> List[Founder]:
+    """
+    То же, что get_founders, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Founder; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_founder(
         session: AsyncSession, founder_id: int, data: dict
 ) -> Optional[Founder]:
@@ -168,6 +206,7 @@ async def update_founder(
     founder = res.scalar_one_or_none()
     if founder:
         await session.commit()
+        invalidate_founder(founder_id)
         logger.info(f"Updated Founder id={founder_id}")
     else:
         await session.rollback()
@@ -191,6 +230,7 @@ async def delete_founder(session: AsyncSession, founder_id: int) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_founder(founder_id)
         logger.info(f"Deleted Founder id={founder_id}")
     else:
         await session.rollback()
@@ -27,6 +27,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.logger import configure_logger
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 
 logger = configure_logger(prefix="MATERIALS", color="magenta", level="INFO")
 
@@ -50,7 +51,7 @@ class Material(Base):
     )
 
     outcomes = relationship(
-        "Outcome", back_populates="material", lazy="selectin"
+        "Outcome", back_populates="material", lazy="raise_on_sql"
     )
 
 
@@ -81,8 +82,8 @@ async def create_material(session: AsyncSession, name: str) -> Material:
     material = Material(name=name)
     session.add(material)
     try:
-        await session.flush()
         await session.commit()
+        _cache.invalidate_list()
         logger.info(f"Created Material id={material.material_id} name={name}")
         return material
     except IntegrityError as exc:
@@ -107,10 +108,31 @@ async def get_material(
     stmt = select(Material).where(Material.material_id == material_id)
     res = await session.execute(stmt)
     material = res.scalar_one_or_none()
-    logger.debug(f"Fetched Material id={material_id}: found={material is not None}")
+    logger.debug("Fetched Material id={}: found={}", material_id, material is not None)
     return material
 
 
+async def get_material_cached(
+    session: AsyncSession, material_id: int
+) -> Optional[Material]:
+    """
+    То же, что get_material, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        material_id: Идентификатор записи.
+
+    Returns:
+        Объект Material или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, material_id)
+
+
+def invalidate_material(material_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_material_cached / get_materials_cached: запись или целиком (None)."""
+    _cache.invalidate(material_id)
+
+
 async def get_materials(session: AsyncSession) -> List[Material]:
     """
     Получить все материалы.
@@ -124,10 +146,26 @@ async def get_materials(session: AsyncSession) -> List[Material]:
     stmt = select(Material)
     res = await session.execute(stmt)
     materials = res.scalars().all()
-    logger.debug(f"Fetched {len(materials)} materials")
+    logger.debug("Fetched {} materials", len(materials))
     return materials
 
 
+_cache = RefTableCache(get_material, get_materials)
+
+
+async def get_materials_cached(session: AsyncSession) -> List[Material]:
+    """
+    То же, что get_materials, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Material; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_material(
         session: AsyncSession, material_id: int, data: dict
 ) -> Optional[Material]:
@@ -171,6 +209,7 @@ async def update_material(
     material = res.scalar_one_or_none()
     if material:
         await session.commit()
+        invalidate_material(material_id)
         logger.info(f"Updated Material id={material_id}")
     else:
         await session.rollback()
@@ -194,6 +233,7 @@ async def delete_material(session: AsyncSession, material_id: int) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_material(material_id)
         logger.info(f"Deleted Material id={material_id}")
     else:
         await session.rollback()
@@ -27,6 +27,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import select, update, delete
 
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
 from src.core.logger import configure_logger
 
 logger = configure_logger(prefix="PROJECTS", color="magenta", level="INFO")
@@ -52,10 +53,10 @@ class Project(Base):
     )
 
     incomes = relationship(
-        "Income", back_populates="project", lazy="selectin"
+        "Income", back_populates="project", lazy="raise_on_sql"
     )
     outcomes = relationship(
-        "Outcome", back_populates="project", lazy="selectin"
+        "Outcome", back_populates="project", lazy="raise_on_sql"
     )
 
 
@@ -87,8 +88,8 @@ async def create_project(session: AsyncSession, name: str) -> Project:
     project = Project(name=name)
     session.add(project)
     try:
-        await session.flush()
         await session.commit()
+        _cache.invalidate_list()
         logger.info(f"Created Project id={project.project_id} name={name}")
         return project
     except IntegrityError as exc:
@@ -113,10 +114,31 @@ async def get_project(
     stmt = select(Project).where(Project.project_id == project_id)
     res = await session.execute(stmt)
     project = res.scalar_one_or_none()
-    logger.debug(f"Fetched Project id={project_id}: found={project is not None}")
+    logger.debug("Fetched Project id={}: found={}", project_id, project is not None)
     return project
 
 
+async def get_project_cached(
+    session: AsyncSession, project_id: int
+) -> Optional[Project]:
+    """
+    То же, что get_project, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        project_id: Идентификатор записи.
+
+    Returns:
+        Объект Project или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, project_id)
+
+
+def invalidate_project(project_id: Optional[int] = None) -> None:
+    """Сбросить кэш get_project_cached / get_projects_cached: запись или целиком (None)."""
+    _cache.invalidate(project_id)
+
+
 async def get_projects(session: AsyncSession) -> List[Project]:
     """
     Получить все проекты.
@@ -130,10 +152,26 @@ async def get_projects(session: AsyncSession) -> List[Project]:
     stmt = select(Project)
     res = await session.execute(stmt)
     projects = res.scalars().all()
-    logger.debug(f"Fetched {len(projects)} projects")
+    logger.debug("Fetched {} projects", len(projects))
     return projects
 
 
+_cache = RefTableCache(get_project, get_projects)
+
+
+async def get_projects_cached(session: AsyncSession) -> List[Project]:
+    """
+    То же, что get_projects, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Project; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_project(
     session: AsyncSession, project_id: int, data: dict
 ) -> Optional[Project]:
@@ -168,6 +206,7 @@ async def update_project(
     project = res.scalar_one_or_none()
     if project:
         await session.commit()
+        invalidate_project(project_id)
         logger.info(f"Updated Project id={project_id}")
     else:
         await session.rollback()
@@ -191,6 +230,7 @@ async def delete_project(session: AsyncSession, project_id: int) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_project(project_id)
         logger.info(f"Deleted Project id={project_id}")
     else:
         await session.rollback()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# FinFlow/src/db/models/refs.py
+"""
+Пакетное получение подписей справочников для сводок операций.
+
+Содержит:
+    • `fetch_refs` — один SELECT со скалярными подзапросами вместо серии
+      `get_wallet` / `get_project` / `get_article` / … на каждый рендер.
+
+Возвращаются только отображаемые подписи (номер кошелька, имя и т.п.), без
+загрузки ORM‑объектов и их `selectin`‑связей.
+"""
+
+# --------------------------------------------------------------------------- #
+# Imports & logger                                                            #
+# --------------------------------------------------------------------------- #
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logger import configure_logger
+from src.db.models.articles import Article
+from src.db.models.contractors import Contractor
+from src.db.models.creditors import Creditor
+from src.db.models.employees import Employee
+from src.db.models.founders import Founder
+from src.db.models.materials import Material
+from src.db.models.projects import Project
+from src.db.models.wallets import Wallet
+
+logger = configure_logger(prefix="REFS", color="blue", level="INFO")
+
+# вид справочника → (колонка подписи, первичный ключ)
+REF_COLUMNS = {
+    "wallet":     (Wallet.wallet_number, Wallet.wallet_id),
+    "creditor":   (Creditor.name, Creditor.creditor_id),
+    "project":    (Project.name, Project.project_id),
+    "article":    (Article.name, Article.article_id),
+    "contractor": (Contractor.name, Contractor.contractor_id),
+    "material":   (Material.name, Material.material_id),
+    "employee":   (Employee.name, Employee.employee_id),
+    "founder":    (Founder.name, Founder.founder_id),
+}
+
+
+# --------------------------------------------------------------------------- #
+# Batch lookup                                                                #
+# --------------------------------------------------------------------------- #
+async def fetch_refs(
+    session: AsyncSession,
+    *,
+    wallet_id: Optional[str] = None,
+    creditor_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    article_id: Optional[int] = None,
+    contractor_id: Optional[int] = None,
+    material_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    founder_id: Optional[int] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Получить подписи нескольких справочников за один запрос.
+
+    Args:
+        session: Асинхронная сессия БД.
+        wallet_id … founder_id: Идентификаторы; None — справочник не нужен.
+
+    Returns:
+        Словарь {"wallet": "<номер>", "article": "<название>", …} только для
+        переданных ID. Если запись не найдена, значение — None.
+    """
+    ids = {
+        "wallet": wallet_id,
+        "creditor": creditor_id,
+        "project": project_id,
+        "article": article_id,
+        "contractor": contractor_id,
+        "material": material_id,
+        "employee": employee_id,
+        "founder": founder_id,
+    }
+    wanted = {kind: ref_id for kind, ref_id in ids.items() if ref_id is not None}
+    if not wanted:
+        return {}
+
+    stmt = select(*(
+        select(REF_COLUMNS[kind][0])
+        .where(REF_COLUMNS[kind][1] == ref_id)
+        .scalar_subquery()
+        .label(kind)
+        for kind, ref_id in wanted.items()
+    ))
+    row = (await session.execute(stmt)).one()
+    refs = dict(row._mapping)
+    logger.debug("Fetched refs {}: {}", wanted, refs)
+    return refs
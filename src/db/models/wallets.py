@@ -24,9 +24,11 @@ from sqlalchemy import String
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import delete, lambda_stmt, select, update
 
 from src.db.service.base import Base
+from src.db.service.cache import RefTableCache
+from src.db.service.session import get_async_session
 from src.core.logger import configure_logger
 
 logger = configure_logger(prefix="WALLETS", color="blue", level="INFO")
@@ -48,20 +50,21 @@ class Wallet(Base):
         String(100), nullable=False, unique=True, doc="Номер или адрес кошелька"
     )
 
-    # обратные отношения
-    incomes = relationship("Income", back_populates="wallet", lazy="selectin")
-    outcomes = relationship("Outcome", back_populates="wallet", lazy="selectin")
+    # обратные отношения; в кэш кладётся только сам кошелёк — операции
+    # по нему не подгружаются (при обращении без явной загрузки — ошибка)
+    incomes = relationship("Income", back_populates="wallet", lazy="raise_on_sql")
+    outcomes = relationship("Outcome", back_populates="wallet", lazy="raise_on_sql")
     incoming_transfers = relationship(
         "Transfer",
         back_populates="wallet_to",
         foreign_keys="[Transfer.to_wallet]",  # Указываем конкретный внешний ключ
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     outgoing_transfers = relationship(
         "Transfer",
         back_populates="wallet_from",
         foreign_keys="[Transfer.from_wallet]",  # Указываем конкретный внешний ключ
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
 
 
@@ -95,8 +98,8 @@ async def create_wallet(
     wallet = Wallet(wallet_id=wallet_id, wallet_number=wallet_number)
     session.add(wallet)
     try:
-        await session.flush()
         await session.commit()
+        _cache.invalidate_list()
         logger.info(f"Created Wallet id={wallet_id}")
         return wallet
     except IntegrityError as exc:
@@ -118,13 +121,63 @@ async def get_wallet(
     Returns:
         Объект Wallet или None.
     """
-    stmt = select(Wallet).where(Wallet.wallet_id == wallet_id)
+    # lambda_stmt кэширует и построение, и компиляцию запроса; wallet_id — параметр
+    stmt = lambda_stmt(lambda: select(Wallet).where(Wallet.wallet_id == wallet_id))
     res = await session.execute(stmt)
     wallet = res.scalar_one_or_none()
-    logger.debug(f"Fetched Wallet id={wallet_id}: found={wallet is not None}")
+    logger.debug("Fetched Wallet id={}: found={}", wallet_id, wallet is not None)
     return wallet
 
 
+async def get_wallet_cached(
+    session: AsyncSession, wallet_id: str
+) -> Optional[Wallet]:
+    """
+    То же, что get_wallet, но с TTL‑кэшем в памяти процесса.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+        wallet_id: Идентификатор записи.
+
+    Returns:
+        Объект Wallet или None (отсутствие не кэшируется).
+    """
+    return await _cache.get(session, wallet_id)
+
+
+def peek_wallet(wallet_id: str) -> Optional[Wallet]:
+    """Кошелёк из кэша get_wallet_cached без обращения к БД (None — промах)."""
+    return _cache.peek(wallet_id)
+
+
+async def get_wallet_number(
+    wallet_id: str, session: Optional[AsyncSession] = None
+) -> str:
+    """
+    Номер кошелька для подписей в сообщениях бота.
+
+    Args:
+        wallet_id: Идентификатор кошелька.
+        session: Уже открытая сессия; None — открыть свою (только при промахе кэша).
+
+    Returns:
+        wallet_number или сам wallet_id, если кошелёк не найден.
+    """
+    wallet = peek_wallet(wallet_id)
+    if wallet is None:
+        if session is None:
+            async with get_async_session() as session:
+                wallet = await get_wallet_cached(session, wallet_id)
+        else:
+            wallet = await get_wallet_cached(session, wallet_id)
+    return wallet.wallet_number if wallet else str(wallet_id)
+
+
+def invalidate_wallet(wallet_id: Optional[str] = None) -> None:
+    """Сбросить кэш get_wallet_cached / get_wallets_cached: запись или целиком (None)."""
+    _cache.invalidate(wallet_id)
+
+
 async def get_wallets(session: AsyncSession) -> List[Wallet]:
     """
     Получить список всех кошельков.
@@ -138,10 +191,26 @@ async def get_wallets(session: AsyncSession) -> List[Wallet]:
     stmt = select(Wallet)
     res = await session.execute(stmt)
     wallets = res.scalars().all()
-    logger.debug(f"Fetched {len(wallets)} wallets")
+    logger.debug("Fetched {} wallets", len(wallets))
     return wallets
 
 
+_cache = RefTableCache(get_wallet, get_wallets)
+
+
+async def get_wallets_cached(session: AsyncSession) -> List[Wallet]:
+    """
+    То же, что get_wallets, но список держится в TTL‑кэше.
+
+    Args:
+        session: Асинхронная сессия БД (используется только при промахе).
+
+    Returns:
+        Список объектов Wallet; он общий для всех вызовов — не изменять.
+    """
+    return await _cache.get_all(session)
+
+
 async def update_wallet(
     session: AsyncSession, wallet_id: str, data: dict
 ) -> Optional[Wallet]:
@@ -172,6 +241,7 @@ async def update_wallet(
     wallet = res.scalar_one_or_none()
     if wallet:
         await session.commit()
+        invalidate_wallet(wallet_id)
         logger.info(f"Updated Wallet id={wallet_id}")
     else:
         await session.rollback()
@@ -195,6 +265,7 @@ async def delete_wallet(session: AsyncSession, wallet_id: str) -> bool:
     deleted = res.rowcount > 0
     if deleted:
         await session.commit()
+        invalidate_wallet(wallet_id)
         logger.info(f"Deleted Wallet id={wallet_id}")
     else:
         await session.rollback()
@@ -122,8 +122,7 @@ async def create_income(session: AsyncSession, data: dict) -> Income:
 
     income = Income(**data)
     session.add(income)
-    await session.flush()  # получить PK
-    await session.commit()
+    await session.commit()  # commit сам делает flush и получает PK
     logger.info(f"Created Income id={income.transaction_id}")
     return income
 
@@ -142,7 +141,7 @@ async def get_income(session: AsyncSession, transaction_id: int) -> Optional[Inc
     stmt = select(Income).where(Income.transaction_id == transaction_id)
     res = await session.execute(stmt)
     income = res.scalar_one_or_none()
-    logger.debug(f"Fetched Income id={transaction_id}: found={income is not None}")
+    logger.debug("Fetched Income id={}: found={}", transaction_id, income is not None)
     return income
 
 
@@ -27,6 +27,7 @@ from sqlalchemy import (
     ForeignKey,
     String,
     Text,
+    insert,
     select,
     update,
     delete,
@@ -137,9 +138,9 @@ async def create_outcome(session: AsyncSession, data: dict) -> Outcome:
         if await session.get(Creditor, cid) is None:
             raise ValueError(f"Creditor id={cid} does not exist")
 
-    outcome = Outcome(**data)
-    session.add(outcome)
-    await session.flush()
+    # один INSERT … RETURNING вместо add/flush через unit of work
+    res = await session.execute(insert(Outcome).values(**data).returning(Outcome))
+    outcome = res.scalar_one()
     await session.commit()
     logger.info(f"Created Outcome id={outcome.transaction_id}")
     return outcome
@@ -149,7 +150,7 @@ async def get_outcome(session: AsyncSession, transaction_id: int) -> Optional[Ou
     """Получить расход по ID."""
     res = await session.execute(select(Outcome).where(Outcome.transaction_id == transaction_id))
     outcome = res.scalar_one_or_none()
-    logger.debug(f"Fetched Outcome id={transaction_id}: found={bool(outcome)}")
+    logger.debug("Fetched Outcome id={}: found={}", transaction_id, bool(outcome))
     return outcome
 
 
@@ -124,7 +124,6 @@ async def create_transfer(session: AsyncSession, data: dict) -> Transfer:
 
     transfer = Transfer(**data)
     session.add(transfer)
-    await session.flush()
     await session.commit()
     logger.info(
         f"Created Transfer id={transfer.transaction_id} "
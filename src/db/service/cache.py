@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# FinFlow/src/db/service/cache.py
+"""
+Простой in‑process TTL‑кэш для справочников.
+
+* Справочники (кошельки, проекты, статьи …) меняются редко, а читаются на
+  каждом клике — держим найденные строки в памяти `ttl` секунд.
+* Вытеснение — LRU при превышении `maxsize`.
+* CRUD‑функции справочников сами инвалидируют запись при update/delete.
+* `RefTableCache` — общая обвязка для модулей справочников
+  (`get_x_cached` / `get_xs_cached` / `invalidate_x`).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class TTLCache:
+    """LRU‑словарь с ограниченным временем жизни записей."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RefTableCache:
+    """
+    Кэш одного справочника: записи по первичному ключу и полный список.
+
+    Args:
+        get_one: `await get_one(session, key)` — запись или None.
+        get_all: `await get_all(session)` — все записи.
+        maxsize / ttl: параметры нижележащего TTLCache.
+    """
+
+    _ALL_KEY = ("__all__",)  # ключ полного списка; ID справочников не кортежи
+
+    def __init__(
+        self,
+        get_one: Callable[[AsyncSession, Any], Awaitable[Any]],
+        get_all: Callable[[AsyncSession], Awaitable[Sequence[Any]]],
+        maxsize: int = 512,
+        ttl: float = 300.0,
+    ) -> None:
+        self._get_one = get_one
+        self._get_all = get_all
+        self._data = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, session: AsyncSession, key: Hashable) -> Any:
+        """Запись по ключу; в БД — только при промахе (None не кэшируется)."""
+        row = self._data.get(key)
+        if row is None:
+            row = await self._get_one(session, key)
+            if row is not None:
+                self._data[key] = row
+        return row
+
+    def peek(self, key: Hashable) -> Any:
+        """Запись из кэша без обращения к БД (None — промах)."""
+        return self._data.get(key)
+
+    async def get_all(self, session: AsyncSession) -> List[Any]:
+        """Полный список; он общий для всех вызовов — не изменять."""
+        items = self._data.get(self._ALL_KEY)
+        if items is None:
+            items = self._data[self._ALL_KEY] = list(await self._get_all(session))
+        return items
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Сбросить запись (и полный список) или весь кэш (None)."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+            self._data.pop(self._ALL_KEY, None)
+
+    def invalidate_list(self) -> None:
+        """Сбросить только полный список (после добавления записи)."""
+        self._data.pop(self._ALL_KEY, None)
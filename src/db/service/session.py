@@ -31,7 +31,22 @@ _settings = get_settings()
 engine: AsyncEngine = create_async_engine(
     _settings.database_url,
     # echo=_settings.debug,
+    pool_size=_settings.db_pool_size,        # параллельные хендлеры бота
+    max_overflow=_settings.db_max_overflow,  # запас на всплески кликов
+    pool_timeout=_settings.db_pool_timeout,
+    pool_recycle=_settings.db_pool_recycle,  # раньше idle‑таймаутов PG/прокси
     pool_pre_ping=True,
+    connect_args={
+        "server_settings": {"jit": "off"},   # короткие OLTP‑запросы, JIT только мешает
+        "command_timeout": 60,
+    },
+)
+logger.debug(
+    "Engine pool: size={}, overflow={}, timeout={}s, recycle={}s",
+    _settings.db_pool_size,
+    _settings.db_max_overflow,
+    _settings.db_pool_timeout,
+    _settings.db_pool_recycle,
 )
 
 async_session_maker: async_sessionmaker[AsyncSession] = async_sessionmaker(
@@ -56,7 +71,10 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
             await session.commit()
-        except Exception:
+        except BaseException as exc:
+            # в т.ч. CancelledError: соединение не должно вернуться в пул
+            # с незакрытой транзакцией
             await session.rollback()
-            logger.exception("Session rollback due to exception")
+            if isinstance(exc, Exception):
+                logger.exception("Session rollback due to exception")
             raise